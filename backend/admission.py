@@ -0,0 +1,161 @@
+"""추론 요청 admission control (동시 실행 제한 + 대기열 상한 + 마감 시간 기반 거절)
+
+트래픽이 몰릴 때 /api/convert 가 끝없이 쌓여 모든 요청이 함께 느려지는 것을 막는다.
+  - 동시에 추론하는 요청은 ADMISSION_CONCURRENCY 개까지
+  - 기다리는 요청은 ADMISSION_QUEUE 개까지, 넘으면 바로 거절
+  - 예상 대기 시간(대기 순번 × 평균 처리 시간)이 마감(ADMISSION_DEADLINE_MS 또는 X-Deadline-Ms)을
+    넘으면 기다리지 않고 바로 거절, 기다리다 마감이 지나도 거절
+거절(Overloaded)을 받은 쪽은 503 + Retry-After 로 응답하거나 규칙 기반 추천으로 낮춰(degraded) 응답한다.
+"""
+import math
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+ADMISSION_CONCURRENCY = int(os.getenv("ADMISSION_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+ADMISSION_QUEUE = int(os.getenv("ADMISSION_QUEUE", "32"))
+ADMISSION_DEADLINE_MS = float(os.getenv("ADMISSION_DEADLINE_MS", "1000"))
+# 모델 대기열이 차면 503 대신 규칙 기반(name_logic) 추천으로 응답
+ADMISSION_DEGRADE = os.getenv("ADMISSION_DEGRADE", "1") == "1"
+
+
+class Overloaded(Exception):
+    def __init__(self, reason, retry_after=1):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """sync 서버(app.py)는 slot(), ASGI(asgi.py)는 async_slot() 을 쓴다."""
+
+    def __init__(self, concurrency=ADMISSION_CONCURRENCY, queue=ADMISSION_QUEUE, deadline_ms=ADMISSION_DEADLINE_MS):
+        self.concurrency = concurrency
+        self.queue = queue
+        self.deadline = deadline_ms / 1000
+        self._sem = threading.BoundedSemaphore(concurrency)
+        self._async_sem = None
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.running = 0
+        self.service_time = 0.0  # 처리 시간 EWMA (초)
+        self.counters = {"admitted": 0, "shed_queue_full": 0, "shed_deadline": 0, "degraded": 0}
+
+    def count(self, key):
+        with self._lock:
+            self.counters[key] += 1
+
+    def _reserve(self, deadline):
+        """대기열 자리를 잡는다. 가득 찼거나 마감 안에 차례가 오지 않을 것 같으면 거절."""
+        with self._lock:
+            if self.waiting >= self.queue:
+                self.counters["shed_queue_full"] += 1
+                raise Overloaded("queue_full", self._retry_after())
+            expected = (self.waiting + 1) / self.concurrency * self.service_time
+            if self.running >= self.concurrency and expected > deadline:
+                self.counters["shed_deadline"] += 1
+                raise Overloaded("deadline", self._retry_after())
+            self.waiting += 1
+
+    def _unreserve(self):
+        with self._lock:
+            self.waiting -= 1
+
+    def _deadline(self, deadline_ms):
+        """요청별 마감(초). 클라이언트 값은 기본 마감보다 짧게만 줄일 수 있다."""
+        if deadline_ms is None or not math.isfinite(deadline_ms) or deadline_ms <= 0:
+            return self.deadline
+        return min(deadline_ms / 1000, self.deadline)
+
+    def _retry_after(self):
+        # 현재 대기열이 빠지는 데 걸릴 시간 (초, 최소 1)
+        return max(1, math.ceil(self.waiting / self.concurrency * self.service_time))
+
+    def _admitted(self, waited_ok, queued=True):
+        with self._lock:
+            if queued:
+                self.waiting -= 1
+            if not waited_ok:
+                self.counters["shed_deadline"] += 1
+                raise Overloaded("deadline", self._retry_after())
+            self.running += 1
+            self.counters["admitted"] += 1
+
+    def _release(self, start):
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.running -= 1
+            self.service_time = elapsed if not self.service_time else 0.9 * self.service_time + 0.1 * elapsed
+
+    @contextmanager
+    def slot(self, deadline_ms=None):
+        if self._sem.acquire(blocking=False):
+            self._admitted(True, queued=False)
+        else:
+            deadline = self._deadline(deadline_ms)
+            self._reserve(deadline)
+            try:
+                ok = self._sem.acquire(timeout=deadline)
+            except BaseException:
+                self._unreserve()  # 대기열 자리를 돌려주지 않으면 queue_full 로 영구히 막힌다
+                raise
+            self._admitted(ok)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(start)
+            self._sem.release()
+
+    @asynccontextmanager
+    async def async_slot(self, deadline_ms=None):
+        import asyncio  # ASGI 에서만 필요 (WSGI cold start 에서 asyncio import 비용 제외)
+
+        if self._async_sem is None:
+            self._async_sem = asyncio.Semaphore(self.concurrency)
+        if not self._async_sem.locked():
+            await self._async_sem.acquire()  # 바로 얻을 수 있으면 대기열을 거치지 않는다
+            self._admitted(True, queued=False)
+        else:
+            deadline = self._deadline(deadline_ms)
+            self._reserve(deadline)
+            try:
+                await asyncio.wait_for(self._async_sem.acquire(), deadline)
+                ok = True
+            except TimeoutError:
+                ok = False
+            except BaseException:  # 연결 끊김 등으로 취소
+                self._unreserve()
+                raise
+            self._admitted(ok)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(start)
+            self._async_sem.release()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "queue": self.queue,
+                "deadline_ms": round(self.deadline * 1000),
+                "running": self.running,
+                "waiting": self.waiting,
+                "service_time_ms": round(self.service_time * 1000, 3),
+                **self.counters,
+            }
+
+
+def deadline_from(headers):
+    """X-Deadline-Ms 헤더(클라이언트가 기다릴 수 있는 시간)가 유한한 양수이면 그 값을 쓴다.
+
+    ADMISSION_DEADLINE_MS 보다 긴 값은 AdmissionController 가 기본 마감으로 자른다.
+    """
+    try:
+        value = float(headers.get("X-Deadline-Ms"))
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) and value > 0 else None
@@ -1,26 +1,73 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
 import os
-import sentry_sdk
-from name_logic import recommend_korean_names
-from models import NameHistory
-from db import SessionLocal, Base, engine
-import models  # noqa: F401  # 모델을 메타데이터에 등록하기 위함
+import time
+
+from flask import Flask, Response, g, jsonify, request, stream_with_context
+from flask_cors import CORS
+
+import metrics
+from admission import ADMISSION_DEGRADE, AdmissionController, Overloaded, deadline_from
+from metrics import stage
+from name_logic import GENDERS, recommend_korean_names
 
-# Sentry 초기화
+# cold start 를 줄이기 위해 무거운 모듈(sentry_sdk, SQLAlchemy/모델, numpy 를 쓰는 인덱스/레지스트리)은
+# 처음 필요할 때 import 한다. 테이블 생성은 import 시 하지 않는다: `flask --app app init-db`
+
+# Sentry 초기화 (route 별 샘플링: metrics.traces_sampler)
 SENTRY_DSN = os.getenv("SENTRY_DSN")
 if SENTRY_DSN:
-    sentry_sdk.init(dsn=SENTRY_DSN, traces_sample_rate=1.0)
+    import sentry_sdk
+    sentry_sdk.init(dsn=SENTRY_DSN, traces_sampler=metrics.traces_sampler)
 
 app = Flask(__name__)
 CORS(app)
 
-# DB 초기화 (before_first_request 대신 수동 호출)
+# 모델 레지스트리: active 버전이 없으면 규칙 기반 추천을 사용 (첫 요청 때 생성)
+_registry = None
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        from model_registry import ModelRegistry
+        _registry = ModelRegistry()
+    return _registry
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# 오타 입력("Jonathon")을 알려진 영어 이름("Jonathan")으로 바꾼 뒤 추천
+FUZZY_LOOKUP = os.getenv("FUZZY_LOOKUP", "1") == "1"
+GENDER_ERROR = f"gender must be one of {', '.join(GENDERS)}"
+# 추론 동시 실행/대기열 제한 (초과 시 503 또는 규칙 기반 응답)
+admission = AdmissionController()
+metrics.register_collector(lambda: metrics.counter_lines(
+    f"{metrics.PREFIX}_admission_total", "admission 결과별 요청 수", admission.counters, "result"))
+
+# DB 초기화 (배포/마이그레이션 단계에서 한 번: `flask --app app init-db`)
 def init_db():
+    import models  # noqa: F401  # 모델을 메타데이터에 등록하기 위함
+    from db import Base, engine
     Base.metadata.create_all(bind=engine)
 
-# 초기화 실행
-init_db()
+@app.cli.command("init-db")
+def init_db_command():
+    """테이블 생성 (이미 있으면 그대로 둔다)"""
+    init_db()
+    print("[DONE] tables created")
+
+# 요청/단계별 지연시간 → /metrics, Server-Timing 헤더
+@app.before_request
+def start_timer():
+    g.start = time.perf_counter()
+    metrics.begin(request.url_rule.rule if request.url_rule else "unmatched")
+
+@app.after_request
+def add_server_timing(response):
+    timing = metrics.finish(request.method, response.status_code, time.perf_counter() - g.start)
+    if timing:
+        response.headers["Server-Timing"] = timing
+    return response
+
+@app.route("/metrics")
+def metrics_endpoint():
+    return metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
 
 @app.route("/")
 def health_check():
@@ -28,25 +75,146 @@ def health_check():
 
 @app.route("/api/recommend", methods=["POST"])
 def recommend():
-    data = request.get_json(force=True)
+    with stage("parse"):
+        data = request.get_json(force=True)
     name = data.get("name", "").strip()
     if not name:
         return {"error": "Name is required"}, 400
+    gender = data.get("gender") or None
+    if gender not in (None, *GENDERS):
+        return {"error": GENDER_ERROR}, 400
 
-    candidates = recommend_korean_names(name, k=3)
+    with stage("rule_based"):
+        candidates = recommend_korean_names(name, k=3, gender=gender)
     # /api/recommend 는 이전 호환성을 위해 첫 번째 후보만 반환
     return jsonify(candidates[0])
 
+def convert_name(english_name, gender=None):
+    """영어 이름 → {"candidates": [...]} (ASGI 앱도 같은 함수를 executor 에서 호출)
+
+    gender 는 규칙 기반 추천에만 적용된다 (모델 추천은 성별 구분 없이 고른다).
+    """
+    start = time.perf_counter()
+    with stage("fuzzy"):
+        if FUZZY_LOOKUP:
+            import fuzzy
+            index = fuzzy.get_index()  # DB 를 쓸 수 없으면 None (오타 보정 없이 추천)
+            matched = index.canonical(english_name) if index else None
+        else:
+            matched = None
+    query = matched or english_name
+    registry = get_registry()
+    active = registry.active
+    if active:
+        candidates = active[1].recommend(query, k=3)
+    else:
+        with stage("rule_based"):
+            candidates = recommend_korean_names(query, k=3, gender=gender)
+    registry.maybe_shadow(query, 3, candidates, time.perf_counter() - start)
+    result = {"candidates": candidates}
+    if matched and matched.lower() != english_name.lower():
+        # 오타 보정으로 바뀐 이름과 사용자가 입력한 이름을 함께 돌려준다
+        result["matchedName"] = matched
+        result["originalName"] = english_name
+    return result
+
+def shed_response(english_name, err, controller=admission, gender=None):
+    """admission 거절 시: 규칙 기반 추천으로 낮춰 응답하거나 503 + Retry-After"""
+    if ADMISSION_DEGRADE:
+        controller.count("degraded")
+        return {"candidates": recommend_korean_names(english_name, k=3, gender=gender), "degraded": True}, 200, {}
+    return {"error": "Service overloaded", "reason": err.reason}, 503, {"Retry-After": str(err.retry_after)}
+
 # 신규 API: 여러 후보 반환
 @app.route("/api/convert", methods=["POST"])
 def convert():
-    data = request.get_json(force=True)
+    with stage("parse"):
+        data = request.get_json(force=True)
     english_name = data.get("englishName") or data.get("name")
     if not english_name or not english_name.strip():
         return {"error": "englishName is required"}, 400
 
-    candidates = recommend_korean_names(english_name.strip(), k=3)
-    return jsonify({"candidates": candidates})
+    gender = data.get("gender") or None
+    if gender not in (None, *GENDERS):
+        return {"error": GENDER_ERROR}, 400
+
+    english_name = english_name.strip()
+    try:
+        with admission.slot(deadline_from(request.headers)):
+            result = convert_name(english_name, gender)
+        with stage("serialize"):
+            return jsonify(result)
+    except Overloaded as e:
+        return shed_response(english_name, e, gender=gender)
+
+# 영어 이름 자동완성 (메모리 인덱스, 요청당 DB 조회 없음)
+@app.route("/api/suggest", methods=["GET"])
+def suggest_names():
+    import suggest
+    prefix = request.args.get("prefix", "")
+    limit = min(request.args.get("limit", suggest.SUGGEST_LIMIT, type=int), 50)
+    if not prefix.strip():
+        return {"error": "prefix is required"}, 400
+    index = suggest.get_index()  # DB 를 쓸 수 없으면 None (빈 목록으로 응답)
+    return jsonify({"suggestions": index.suggest(prefix, max(limit, 1)) if index else []})
+
+# 모델 관리 API (ADMIN_TOKEN 헤더 필요)
+def is_admin(req):
+    return bool(ADMIN_TOKEN) and req.headers.get("X-Admin-Token") == ADMIN_TOKEN
+
+@app.route("/api/models", methods=["GET"])
+def model_status():
+    if not is_admin(request):
+        return {"error": "Forbidden"}, 403
+    return jsonify(get_registry().status())
+
+@app.route("/api/admission", methods=["GET"])
+def admission_status():
+    if not is_admin(request):
+        return {"error": "Forbidden"}, 403
+    return jsonify(admission.snapshot())
+
+def activate_request(data):
+    """/api/models/activate 본문 → (응답 본문, 상태 코드). 모델 로드가 끝난 뒤 교체한다 (ASGI 앱과 공유)"""
+    version = data.get("version")
+    if not version or not isinstance(version, str):
+        return {"error": "version is required"}, 400
+    registry = get_registry()
+    if version not in registry.versions():
+        return {"error": "Not found"}, 404
+    try:
+        registry.activate(version)
+    except KeyError:
+        return {"error": "Not found"}, 404
+    return registry.status(), 200
+
+def shadow_request(data):
+    """/api/models/shadow 본문 → (응답 본문, 상태 코드) (ASGI 앱과 공유)"""
+    version = data.get("version")
+    registry = get_registry()
+    if version and version not in registry.versions():
+        return {"error": "Not found"}, 404
+    from model_registry import shadow_fraction
+    try:
+        fraction = shadow_fraction(data.get("fraction", 0.05))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    registry.set_shadow(version, fraction)
+    return registry.status(), 200
+
+@app.route("/api/models/activate", methods=["POST"])
+def activate_model():
+    if not is_admin(request):
+        return {"error": "Forbidden"}, 403
+    body, status = activate_request(request.get_json(force=True) or {})
+    return jsonify(body), status
+
+@app.route("/api/models/shadow", methods=["POST"])
+def shadow_model():
+    if not is_admin(request):
+        return {"error": "Forbidden"}, 403
+    body, status = shadow_request(request.get_json(force=True) or {})
+    return jsonify(body), status
 
 # helper
 def get_user_id(req):
@@ -56,54 +224,115 @@ def get_user_id(req):
 # 저장 API
 @app.route("/api/history/save", methods=["POST"])
 def save_name():
-    data = request.get_json(force=True)
+    with stage("parse"):
+        data = request.get_json(force=True)
     english = data.get("englishName") or data.get("english_name")
     korean = data.get("koreanName") or data.get("korean_name")
     if not english or not korean:
         return {"error": "englishName and koreanName are required"}, 400
 
+    from db import SessionLocal
+    from models import NameHistory
     user_id = get_user_id(request)
     with SessionLocal() as db:
         record = NameHistory(user_id=user_id, english_name=english.strip(), korean_name=korean.strip())
         db.add(record)
-        db.commit()
-        db.refresh(record)
+        with stage("db_commit"):
+            db.commit()
+            db.refresh(record)
         return jsonify({"id": record.id, "savedAt": record.saved_at.isoformat()})
 
 # 조회 API
 @app.route("/api/history", methods=["GET"])
 def list_history():
+    from db import SessionLocal
+    from models import NameHistory
     user_id = get_user_id(request)
     with SessionLocal() as db:
         q = db.query(NameHistory)
         if user_id:
             q = q.filter(NameHistory.user_id == user_id)
-        records = q.order_by(NameHistory.saved_at.desc()).limit(100).all()
-        return jsonify([
-            {
-                "id": r.id,
-                "englishName": r.english_name,
-                "koreanName": r.korean_name,
-                "savedAt": r.saved_at.isoformat(),
-            }
-            for r in records
-        ])
+        with stage("db_query"):
+            records = q.order_by(NameHistory.saved_at.desc()).limit(100).all()
+        with stage("serialize"):
+            return jsonify([
+                {
+                    "id": r.id,
+                    "englishName": r.english_name,
+                    "koreanName": r.korean_name,
+                    "savedAt": r.saved_at.isoformat(),
+                }
+                for r in records
+            ])
+
+# 내보내기: 전체 히스토리를 yield_per 묶음 단위로 읽어 바로 흘려보낸다 (행 수와 무관하게 메모리 일정)
+EXPORT_CHUNK = int(os.getenv("EXPORT_CHUNK", "1000"))
+# mimetype 만 둔다: text/* 에는 Flask/Starlette 가 각자 "; charset=utf-8" 을 붙인다
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_COLUMNS = ("id", "englishName", "koreanName", "savedAt")
+
+def history_export_query(user_id):
+    """X-User-Id 가 있으면 그 사용자의, 없으면 비로그인(user_id 없음) 히스토리 전체 (id 순)"""
+    from sqlalchemy import select
+
+    from models import NameHistory
+    q = select(NameHistory.id, NameHistory.english_name, NameHistory.korean_name, NameHistory.saved_at)
+    q = q.where(NameHistory.user_id == user_id if user_id else NameHistory.user_id.is_(None))
+    # yield_per: ORM 이 결과를 한 번에 버퍼링하지 않고, PostgreSQL 에서는 서버 측 커서를 쓴다
+    return q.order_by(NameHistory.id).execution_options(yield_per=EXPORT_CHUNK)
+
+def encode_export(rows, fmt):
+    """행 묶음 → 응답 조각 하나 (CSV 헤더는 export_header 로 따로 보낸다)"""
+    import json
+    records = [(r.id, r.english_name, r.korean_name, r.saved_at.isoformat() if r.saved_at else None) for r in rows]
+    if fmt == "ndjson":
+        return "".join(json.dumps(dict(zip(EXPORT_COLUMNS, r)), ensure_ascii=False) + "\n" for r in records)
+    import csv
+    import io
+    buf = io.StringIO()
+    csv.writer(buf).writerows(records)
+    return buf.getvalue()
+
+def export_header(fmt):
+    return ",".join(EXPORT_COLUMNS) + "\r\n" if fmt == "csv" else ""
+
+@app.route("/api/history/export", methods=["GET"])
+def export_history():
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        return {"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}, 400
+    query = history_export_query(get_user_id(request))
+
+    def generate():
+        from db import SessionLocal
+        yield export_header(fmt)
+        with SessionLocal() as db:
+            for rows in db.execute(query).partitions():
+                yield encode_export(rows, fmt)
+
+    return Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt],
+                    headers={"Content-Disposition": f"attachment; filename=history.{fmt}"})
 
 # 삭제 API
 @app.route("/api/history/<int:hist_id>", methods=["DELETE"])
 def delete_history(hist_id):
+    from db import SessionLocal
+    from models import NameHistory
     user_id = get_user_id(request)
     with SessionLocal() as db:
         rec = db.query(NameHistory).filter(NameHistory.id == hist_id)
         if user_id:
             rec = rec.filter(NameHistory.user_id == user_id)
-        obj = rec.first()
+        with stage("db_query"):
+            obj = rec.first()
         if not obj:
             return {"error": "Not found"}, 404
         db.delete(obj)
-        db.commit()
+        with stage("db_commit"):
+            db.commit()
         return {"status": "deleted"}, 200
 
 if __name__ == "__main__":
+    init_db()  # 로컬 개발 서버는 편의상 시작 시 테이블 생성
     port = int(os.environ.get("PORT", 5001))
     app.run(debug=True, host="::", port=port)
\ No newline at end of file
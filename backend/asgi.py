@@ -0,0 +1,266 @@
+"""ASGI 진입점 (app.py 와 같은 API 를 비동기로 제공)
+
+- 추론(/api/convert, /api/recommend)은 크기가 제한된 스레드 풀에서 실행해 이벤트 루프를 막지 않는다.
+- 히스토리(/api/history*)는 AsyncSession 으로 DB 를 기다리는 동안 다른 요청을 처리한다.
+- 추천 로직과 모델 레지스트리는 app.py 의 것을 그대로 쓴다 (응답 형식 동일).
+- 관리자 API(/api/models*, /api/admission)도 같은 레지스트리/admission 상태를 다룬다.
+
+실행:
+  uvicorn asgi:app --port 5001
+"""
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Match, Route
+
+import metrics
+import suggest
+from admission import Overloaded, deadline_from
+from app import (
+    EXPORT_FORMATS,
+    GENDER_ERROR,
+    GENDERS,
+    activate_request,
+    admission,
+    convert_name,
+    encode_export,
+    export_header,
+    get_registry,
+    get_user_id,
+    history_export_query,
+    is_admin,
+    recommend_korean_names,
+    shadow_request,
+    shed_response,
+)
+from db import get_async_session
+from metrics import stage
+from models import NameHistory
+
+# 추론 스레드 수 (NumPy 행렬곱은 GIL 을 놓으므로 코어 수 정도까지 이득)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(min(4, os.cpu_count() or 1))))
+executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+
+
+async def run_inference(fn, *args):
+    # 요청의 단계 기록(metrics)이 스레드 안에서도 이어지도록 context 를 복사해 실행
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, ctx.run, fn, *args)
+
+
+async def read_json(request: Request):
+    with stage("parse"):
+        try:
+            return await request.json() or {}
+        except ValueError:
+            return {}
+
+
+def json_response(content, **kwargs):
+    with stage("serialize"):
+        return JSONResponse(content, **kwargs)
+
+
+class TimingMiddleware:
+    """route/단계별 지연시간을 기록하고 Server-Timing 헤더를 붙인다 (app.py 의 before/after_request 와 같음)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        route = next((r.path for r in routes if r.matches(scope)[0] == Match.FULL), "unmatched")
+        metrics.begin(route)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = metrics.finish(scope["method"], message["status"], time.perf_counter() - start)
+                if timing:
+                    message.setdefault("headers", []).append((b"server-timing", timing.encode()))
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+async def metrics_endpoint(request):
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+async def health_check(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def recommend(request):
+    data = await read_json(request)
+    name = (data.get("name") or "").strip()
+    if not name:
+        return JSONResponse({"error": "Name is required"}, status_code=400)
+    gender = data.get("gender") or None
+    if gender not in (None, *GENDERS):
+        return JSONResponse({"error": GENDER_ERROR}, status_code=400)
+    with stage("rule_based"):
+        candidates = await run_inference(recommend_korean_names, name, 3, gender)
+    return json_response(candidates[0])
+
+
+async def convert(request):
+    data = await read_json(request)
+    english_name = data.get("englishName") or data.get("name")
+    if not english_name or not english_name.strip():
+        return JSONResponse({"error": "englishName is required"}, status_code=400)
+    gender = data.get("gender") or None
+    if gender not in (None, *GENDERS):
+        return JSONResponse({"error": GENDER_ERROR}, status_code=400)
+    english_name = english_name.strip()
+    try:
+        async with admission.async_slot(deadline_from(request.headers)):
+            result = await run_inference(convert_name, english_name, gender)
+        return json_response(result)
+    except Overloaded as e:
+        body, status, headers = shed_response(english_name, e, gender=gender)
+        return JSONResponse(body, status_code=status, headers=headers)
+
+
+async def admission_status(request):
+    if not is_admin(request):
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+    return JSONResponse(admission.snapshot())
+
+
+async def model_status(request):
+    if not is_admin(request):
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+    return JSONResponse(get_registry().status())
+
+
+async def activate_model(request):
+    if not is_admin(request):
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+    # 모델 로드는 수 초 걸릴 수 있으므로 이벤트 루프 밖에서 실행
+    body, status = await run_inference(activate_request, await read_json(request))
+    return JSONResponse(body, status_code=status)
+
+
+async def shadow_model(request):
+    if not is_admin(request):
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+    body, status = await run_inference(shadow_request, await read_json(request))
+    return JSONResponse(body, status_code=status)
+
+
+async def suggest_names(request):
+    prefix = request.query_params.get("prefix", "")
+    try:
+        limit = int(request.query_params.get("limit", suggest.SUGGEST_LIMIT))
+    except ValueError:
+        limit = suggest.SUGGEST_LIMIT
+    if not prefix.strip():
+        return JSONResponse({"error": "prefix is required"}, status_code=400)
+    # 첫 호출의 인덱스 빌드(DB 조회)만 스레드로 넘긴다 (DB 를 쓸 수 없으면 None)
+    index = await run_inference(suggest.get_index)
+    suggestions = index.suggest(prefix, max(min(limit, 50), 1)) if index else []
+    return JSONResponse({"suggestions": suggestions})
+
+
+async def save_name(request):
+    data = await read_json(request)
+    english = data.get("englishName") or data.get("english_name")
+    korean = data.get("koreanName") or data.get("korean_name")
+    if not english or not korean:
+        return JSONResponse({"error": "englishName and koreanName are required"}, status_code=400)
+
+    async with get_async_session()() as db:
+        record = NameHistory(user_id=get_user_id(request), english_name=english.strip(), korean_name=korean.strip())
+        db.add(record)
+        with stage("db_commit"):
+            await db.commit()
+            await db.refresh(record)
+        return JSONResponse({"id": record.id, "savedAt": record.saved_at.isoformat()})
+
+
+async def list_history(request):
+    user_id = get_user_id(request)
+    q = select(NameHistory)
+    if user_id:
+        q = q.where(NameHistory.user_id == user_id)
+    async with get_async_session()() as db:
+        with stage("db_query"):
+            records = (await db.scalars(q.order_by(NameHistory.saved_at.desc()).limit(100))).all()
+    return json_response([
+        {
+            "id": r.id,
+            "englishName": r.english_name,
+            "koreanName": r.korean_name,
+            "savedAt": r.saved_at.isoformat(),
+        }
+        for r in records
+    ])
+
+
+async def export_history(request):
+    fmt = request.query_params.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        return JSONResponse({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}, status_code=400)
+    query = history_export_query(get_user_id(request))
+
+    async def generate():
+        yield export_header(fmt)
+        async with get_async_session()() as db:
+            result = await db.stream(query)
+            async for rows in result.partitions():
+                yield encode_export(rows, fmt)
+
+    return StreamingResponse(generate(), media_type=EXPORT_FORMATS[fmt],
+                             headers={"Content-Disposition": f"attachment; filename=history.{fmt}"})
+
+
+async def delete_history(request):
+    user_id = get_user_id(request)
+    q = select(NameHistory).where(NameHistory.id == request.path_params["hist_id"])
+    if user_id:
+        q = q.where(NameHistory.user_id == user_id)
+    async with get_async_session()() as db:
+        with stage("db_query"):
+            obj = (await db.scalars(q)).first()
+        if not obj:
+            return JSONResponse({"error": "Not found"}, status_code=404)
+        await db.delete(obj)
+        with stage("db_commit"):
+            await db.commit()
+    return JSONResponse({"status": "deleted"})
+
+
+routes = [
+    Route("/", health_check),
+    Route("/metrics", metrics_endpoint),
+    Route("/api/recommend", recommend, methods=["POST"]),
+    Route("/api/convert", convert, methods=["POST"]),
+    Route("/api/suggest", suggest_names, methods=["GET"]),
+    Route("/api/admission", admission_status, methods=["GET"]),
+    Route("/api/models", model_status, methods=["GET"]),
+    Route("/api/models/activate", activate_model, methods=["POST"]),
+    Route("/api/models/shadow", shadow_model, methods=["POST"]),
+    Route("/api/history/save", save_name, methods=["POST"]),
+    Route("/api/history", list_history, methods=["GET"]),
+    Route("/api/history/export", export_history, methods=["GET"]),
+    Route("/api/history/{hist_id:int}", delete_history, methods=["DELETE"]),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]),
+        Middleware(TimingMiddleware),
+    ],
+)
@@ -0,0 +1,261 @@
+"""추천/인덱스/히스토리 경로 벤치마크 모음
+
+  - name_logic:  규칙 기반 recommend_korean_names
+  - dual_infer:  1k ~ 1M 행 합성 카탈로그에 대한 Recommender.recommend
+                 (무작위 가중치 NumPy 인코더를 대역으로 써서 TFLite/학습 모델 없이 실행)
+  - history:     /api/history/save, /api/history, /api/history/<id> (임시 SQLite)
+각 항목의 처리량(ops/sec), p50/p99(ms), 최대 메모리(tracemalloc, 준비 단계 포함)를 JSON 으로 저장하고
+--baseline 과 비교해 기준(--threshold)보다 나빠진 항목을 REGRESSION 으로 표시한다 (종료 코드 1).
+
+사용법:
+  python benchmark_suite.py                                   # 전체 실행 → bench_results.json
+  python benchmark_suite.py --sizes 1000 10000 --only dual_infer
+  python benchmark_suite.py --baseline benchmarks/baseline.json    # 실행 후 기준과 비교
+  python benchmark_suite.py --compare old.json new.json           # 저장된 결과끼리 비교
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+ENGLISH_NAMES = ["Alice", "Jonathan", "Olivia", "Liam", "Emma", "Noah", "Sophia", "Lucas", "Mia", "Ethan",
+                 "Katherine", "Benjamin", "Charlotte", "Henry", "Amelia", "Jack", "Harper", "Leo", "Evelyn", "Oscar"]
+STAND_IN_MAX_LEN = 15  # dual_encoder.MAX_LEN_EN (tensorflow import 없이 쓰기 위해 같은 값)
+HISTORY_ROWS = 1_100  # 목록/삭제 벤치마크용 미리 넣는 행 수 (삭제 반복 + 메모리 측정 반복보다 많게)
+MEMORY_PASS = 50  # 메모리 측정용 반복 횟수 (tracemalloc 오버헤드가 시간 측정에 섞이지 않게 따로 실행)
+
+
+# ---------------- 대역 모델/카탈로그 ----------------
+def stand_in_encoder(charset, max_len, lower, emb_dim=64, units=64, seed=0):
+    """학습된 모델과 같은 구조(Embedding → BiGRU → Dense)의 무작위 가중치 NumpyEncoder."""
+    from numpy_encoder import NumpyEncoder
+
+    rnd = np.random.default_rng(seed)
+    vocab = max(charset.values()) + 1
+
+    def w(*shape):
+        return (rnd.standard_normal(shape) * 0.1).astype(np.float32)
+
+    chars = sorted(charset, key=charset.get)
+    buf = io.BytesIO()
+    np.savez(
+        buf,
+        embedding=w(vocab, emb_dim),
+        f_kernel=w(emb_dim, 3 * units), f_recurrent=w(units, 3 * units), f_bias=w(2, 3 * units),
+        b_kernel=w(emb_dim, 3 * units), b_recurrent=w(units, 3 * units), b_bias=w(2, 3 * units),
+        dense_w=w(2 * units, emb_dim), dense_b=w(emb_dim),
+        chars=np.array(chars, dtype=str), char_ids=np.array([charset[c] for c in chars], dtype=np.int32),
+        max_len=np.int32(max_len), lower=np.bool_(lower),
+    )
+    buf.seek(0)
+    with np.load(buf) as weights:
+        return NumpyEncoder(weights)
+
+
+def synthetic_catalog(n, seed=0):
+    """두 음절 한글 이름 n 행 (연도/성별별 중복 행처럼 같은 이름이 여러 번 나온다)."""
+    from dual_infer import Catalog
+
+    rnd = np.random.default_rng(seed)
+    n_unique = max(1, n // 3)
+    syllables = 0xAC00 + rnd.integers(0, 11172, size=(n_unique, 2))
+    unique = np.array(["".join(map(chr, s)) for s in syllables.tolist()], dtype=object)
+    names = unique[rnd.integers(0, n_unique, size=n)]
+    return Catalog(
+        names,
+        np.full(n, "", dtype=object),
+        rnd.random(n).astype(np.float32),
+        rnd.choice(np.array(["male", "female"], dtype=object), size=n),
+    )
+
+
+def stand_in_recommender(n, seed=0):
+    """카탈로그 임베딩은 무작위 단위 벡터로 두고 영어 쪽만 대역 인코더로 계산한다."""
+    from dual_infer import Recommender
+
+    charset = {c: i + 2 for i, c in enumerate(string.ascii_lowercase)}  # 0: pad, 1: unk
+    encoder_en = stand_in_encoder(charset, STAND_IN_MAX_LEN, True, seed=seed)
+    catalog = synthetic_catalog(n, seed)
+    emb = np.random.default_rng(seed + 1).standard_normal((n, 64)).astype(np.float32)
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    return Recommender(lambda name: encoder_en(encoder_en.tokenize([name]))[0], emb, catalog)
+
+
+# ---------------- 벤치마크 정의: setup() → op(i) ----------------
+def bench_name_logic():
+    from name_logic import recommend_korean_names
+
+    recommend_korean_names("warmup", 3)
+    return lambda i: recommend_korean_names(ENGLISH_NAMES[i % len(ENGLISH_NAMES)], 3)
+
+
+def bench_dual_infer(n):
+    def setup():
+        rec = stand_in_recommender(n)
+        return lambda i: rec.recommend(ENGLISH_NAMES[i % len(ENGLISH_NAMES)], 3)
+    return setup
+
+
+def history_client():
+    """임시 SQLite 를 쓰는 Flask 테스트 클라이언트 (DATABASE_URL 은 app import 전에 정해져야 한다)."""
+    from app import app
+
+    return app.test_client()
+
+
+def bench_history(action):
+    def setup():
+        client = history_client()
+        headers = {"X-User-Id": f"bench-{action}"}
+        if action == "save":
+            def op(i):
+                client.post("/api/history/save", json={"englishName": "Alice", "koreanName": "하린"}, headers=headers)
+            return op
+        # 목록/삭제용 데이터는 DB 에 직접 미리 넣는다
+        from db import SessionLocal
+        from models import NameHistory
+
+        with SessionLocal() as db:
+            records = [NameHistory(user_id=headers["X-User-Id"], english_name="Alice", korean_name="하린")
+                       for _ in range(HISTORY_ROWS)]
+            db.add_all(records)
+            db.commit()
+            ids = [r.id for r in records]
+        if action == "list":
+            return lambda i: client.get("/api/history", headers=headers)
+
+        def op(i):
+            client.delete(f"/api/history/{ids.pop()}", headers=headers)
+        return op
+    return setup
+
+
+def suite(sizes):
+    """(이름, setup, 반복 횟수)"""
+    items = [("name_logic.recommend_korean_names", bench_name_logic, 20_000)]
+    for n in sizes:
+        items.append((f"dual_infer.recommend[{n}]", bench_dual_infer(n), 2_000 if n <= 100_000 else 300))
+    items += [(f"history.{a}", bench_history(a), 1_000) for a in ("save", "list", "delete")]
+    return items
+
+
+# ---------------- 실행/비교 ----------------
+def run_one(setup, iterations):
+    tracemalloc.start()
+    t = time.perf_counter()
+    op = setup()
+    setup_s = time.perf_counter() - t
+    for i in range(min(iterations, MEMORY_PASS)):
+        op(i)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    lat = np.empty(iterations)
+    start = time.perf_counter()
+    for i in range(iterations):
+        t = time.perf_counter()
+        op(i)
+        lat[i] = time.perf_counter() - t
+    total = time.perf_counter() - start
+    return {
+        "ops": iterations,
+        "ops_per_sec": round(iterations / total, 1),
+        "p50_ms": round(float(np.percentile(lat, 50)) * 1000, 4),
+        "p99_ms": round(float(np.percentile(lat, 99)) * 1000, 4),
+        "peak_mem_mb": round(peak / 2**20, 2),
+        "setup_s": round(setup_s, 3),
+    }
+
+
+def run(sizes, only=None):
+    results = {}
+    for name, setup, iterations in suite(sizes):
+        if only and not any(name.startswith(o) for o in only):
+            continue
+        random.seed(0)
+        results[name] = run_one(setup, iterations)
+        print(f"[INFO] {name}: {json.dumps(results[name])}")
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+# 지표별로 나빠지는 방향 (+1: 클수록 나쁨, -1: 작을수록 나쁨)
+DIRECTIONS = {"ops_per_sec": -1, "p50_ms": 1, "p99_ms": 1, "peak_mem_mb": 1}
+
+
+def compare(baseline, current, threshold=0.2):
+    """기준 대비 threshold(비율) 이상 나빠진 (항목, 지표, 기준값, 현재값, 변화율) 목록."""
+    regressions = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"[INFO] {name}: no baseline")
+            continue
+        for metric, direction in DIRECTIONS.items():
+            b, c = base.get(metric), cur.get(metric)
+            if not b or c is None:
+                continue
+            change = (c - b) / b
+            flag = "REGRESSION" if change * direction > threshold else "ok"
+            print(f"  {flag:<10} {name:<40} {metric:<12} {b:>12} → {c:<12} ({change:+.1%})")
+            if flag != "ok":
+                regressions.append((name, metric, b, c, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="dual_infer 카탈로그 행 수")
+    parser.add_argument("--only", nargs="+", help="이름이 이 접두사로 시작하는 항목만 실행")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="실행 후 이 결과 파일과 비교")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="실행 없이 두 결과 파일 비교")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 변화율 (기본 20%%)")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f, open(args.compare[1], encoding="utf-8") as g:
+            regressions = compare(json.load(f), json.load(g), args.threshold)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            # 히스토리 벤치마크는 실제 DB 대신 임시 SQLite 사용 (db 모듈 import 전에 지정)
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            import models  # noqa: F401
+            from db import Base, engine
+            Base.metadata.create_all(bind=engine)
+
+            current = run(args.sizes, args.only)
+            engine.dispose()
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"[DONE] saved {args.out}")
+        regressions = []
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                regressions = compare(json.load(f), current, args.threshold)
+
+    if regressions:
+        print(f"[WARN] {len(regressions)} regression(s) over {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""pytest 공통 설정: 테스트가 저장소의 korean_name.db 를 건드리지 않도록 임시 SQLite 를 쓴다."""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# db.py 가 import 시점에 DATABASE_URL 을 읽으므로 테스트 모듈보다 먼저 지정한다
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'test.db'}")
+sys.path.insert(0, str(Path(__file__).parent))
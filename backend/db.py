@@ -1,7 +1,8 @@
 """DB 엔진, 세션, Base 선언 모듈"""
 import os
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import declarative_base, sessionmaker
 
 # 기본값은 SQLite, 환경변수 DATABASE_URL 이 있으면 우선 사용
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./korean_name.db")
@@ -10,4 +11,30 @@ engine = create_engine(DATABASE_URL, echo=False, future=True)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 
-Base = declarative_base() 
\ No newline at end of file
+Base = declarative_base()
+
+# ASGI 앱(asgi.py)용 비동기 드라이버: sqlite → aiosqlite, postgresql → asyncpg
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+
+
+def async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme.split("+")[0], scheme) + sep + rest
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_url(DATABASE_URL)
+
+_async_session = None
+
+
+def get_async_session():
+    """AsyncSession 팩토리. 비동기 드라이버는 ASGI 앱에서 처음 호출할 때만 필요하다."""
+    global _async_session
+    if _async_session is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        # SQLite 는 쓰기가 파일 잠금으로 직렬화되므로 연결 하나를 돌려 쓰는 편이 잠금 대기보다 빠르다
+        pool = {"pool_size": 1, "max_overflow": 0} if ASYNC_DATABASE_URL.startswith("sqlite") else {}
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, **pool)
+        _async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+    return _async_session
@@ -0,0 +1,409 @@
+"""Dual-Encoder 공용 학습 모듈
+
+train_dual_encoder.py(CSV) / train_excel_dual_encoder.py(Excel) 가 함께 사용하는
+문자 인코딩, 모델 정의, tf.data 입력 파이프라인, 학습/내보내기, 벤치마크를 모아 둔다.
+"""
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers, mixed_precision, models
+
+from name_dataset import split_indices
+from numpy_encoder import NumpyEncoder, export_encoder, max_abs_diff
+
+MODEL_DIR = "models"
+EMB_DIM = 64
+MAX_LEN_EN = 15  # 영어 이름 최대 글자수
+MAX_LEN_KO = 4   # 한글 이름 최대 글자수(2~3자 + 여분)
+BATCH_SIZE = 256
+EPOCHS = 15
+MARGIN = 0.2
+TEMPERATURE = float(os.getenv("TEMPERATURE", "0.05"))
+RECALL_KS = (1, 5, 10)
+HARD_TOP_K = int(os.getenv("HARD_TOP_K", "10"))
+SHUFFLE_BUFFER = int(os.getenv("SHUFFLE_BUFFER", "10000"))
+AUTOTUNE = tf.data.AUTOTUNE
+
+PAD_ID, UNK_ID = 0, 1
+
+
+# -------------------------------------------------
+# 문자 인코딩
+# -------------------------------------------------
+def build_charset(series):
+    chars = set()
+    for text in series:
+        chars.update(list(str(text)))
+    return {c: i + 2 for i, c in enumerate(sorted(chars))}  # 0: pad, 1: unk
+
+
+def encode(text, charset, max_len):
+    return [charset.get(ch, UNK_ID) for ch in list(str(text))[:max_len]]
+
+
+def pad(seq, max_len):
+    return seq + [PAD_ID] * (max_len - len(seq))
+
+
+def vectorize(english_names, korean_names, en_charset, ko_charset):
+    en_vecs = np.array([pad(encode(n.lower(), en_charset, MAX_LEN_EN), MAX_LEN_EN) for n in english_names], dtype=np.int32)
+    ko_vecs = np.array([pad(encode(n, ko_charset, MAX_LEN_KO), MAX_LEN_KO) for n in korean_names], dtype=np.int32)
+    return en_vecs, ko_vecs
+
+
+# -------------------------------------------------
+# 입력 파이프라인
+# -------------------------------------------------
+def make_dataset(x_en, x_ko, batch_size=BATCH_SIZE, training=True, cache=True,
+                 shuffle_buffer=SHUFFLE_BUFFER, prefetch=AUTOTUNE, x_hard=None):
+    """(영어, 한국어) 쌍을 ((en, ko), ko) 배치로 만든다.
+
+    x_hard 가 있으면 ((en, ko, hard), [ko | hard]) 로 hard negative 를 함께 넘긴다.
+    cache → shuffle(매 epoch 재셔플) → batch → label map(병렬) → prefetch 순서로 구성한다.
+    """
+    if x_hard is not None:
+        ds = tf.data.Dataset.from_tensor_slices((x_en, x_ko, x_hard))
+        if cache:
+            ds = ds.cache()
+        if training and shuffle_buffer:
+            ds = ds.shuffle(min(shuffle_buffer, len(x_en)), reshuffle_each_iteration=True)
+        ds = ds.batch(batch_size, drop_remainder=training)
+        ds = ds.map(lambda en, ko, hard: ((en, ko, hard), tf.cast(tf.concat([ko, hard], axis=1), tf.float32)),
+                    num_parallel_calls=AUTOTUNE)
+        return ds.prefetch(prefetch)
+
+    ds = tf.data.Dataset.from_tensor_slices((x_en, x_ko))
+    if cache:
+        ds = ds.cache()
+    if training and shuffle_buffer:
+        ds = ds.shuffle(min(shuffle_buffer, len(x_en)), reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size, drop_remainder=training)
+    # 모든 쌍은 positive. 라벨 자리에는 한국어 ID 를 넘겨 InfoNCE 가 배치 내 동명 후보를 가릴 수 있게 한다
+    ds = ds.map(lambda en, ko: ((en, ko), tf.cast(ko, tf.float32)),
+                num_parallel_calls=AUTOTUNE)
+    return ds.prefetch(prefetch)
+
+
+# -------------------------------------------------
+# 모델
+# -------------------------------------------------
+def build_encoder(vocab_size, max_len):
+    inp = layers.Input(shape=(max_len,), dtype="int32")
+    x = layers.Embedding(vocab_size, EMB_DIM, mask_zero=True)(inp)
+    x = layers.Bidirectional(layers.GRU(128))(x)
+    # mixed precision 에서도 임베딩/유사도는 float32 로 계산
+    x = layers.Dense(EMB_DIM, dtype="float32")(x)
+    x = layers.Lambda(lambda t: tf.math.l2_normalize(t, axis=1), dtype="float32")(x)
+    return models.Model(inp, x)
+
+
+def contrastive_loss(y_true, y_pred):
+    # positive pair 의 cosine 이 margin 보다 작을 때만 벌점 (negative 는 보지 않음)
+    pos_loss = tf.maximum(0.0, MARGIN - y_pred)
+    return tf.reduce_mean(pos_loss)
+
+
+def info_nce_loss(temperature=TEMPERATURE, hard_negatives=False):
+    """in-batch negatives InfoNCE 손실.
+
+    y_pred 는 [emb_en | emb_ko] (hard_negatives 이면 [emb_en | emb_ko | emb_hard]) 를
+    이어 붙인 텐서이다. 배치 내 모든 (영어, 한국어 후보) 조합의 유사도 행렬에서 대각선이
+    정답인 softmax 분류를 영어→한국어, 한국어→영어 양방향으로 계산해 평균한다.
+    hard negative 는 영어→한국어 방향의 후보 열로만 추가된다.
+    y_true 는 한국어 이름 ID 이며, 같은 한국어 이름이 배치에 여러 번 나오면 가짜 negative 이므로 제외한다.
+    """
+    parts = 3 if hard_negatives else 2
+
+    def loss(y_true, y_pred):
+        embs = tf.split(y_pred, parts, axis=1)
+        ids = tf.split(y_true, parts - 1, axis=1)
+        emb_en = embs[0]
+        cand_emb = tf.concat(embs[1:], axis=0)
+        cand_ids = tf.concat(ids, axis=0)
+
+        logits = tf.matmul(emb_en, cand_emb, transpose_b=True) / temperature
+        n = tf.shape(emb_en)[0]
+        m = tf.shape(cand_emb)[0]
+        same = tf.reduce_all(tf.equal(ids[0][:, None, :], cand_ids[None, :, :]), axis=-1)
+        false_neg = tf.logical_and(same, tf.logical_not(tf.eye(n, m, dtype=tf.bool)))
+        logits = tf.where(false_neg, tf.fill(tf.shape(logits), -1e9), logits)
+
+        labels = tf.range(n)
+        loss_en = tf.keras.losses.sparse_categorical_crossentropy(labels, logits, from_logits=True)
+        loss_ko = tf.keras.losses.sparse_categorical_crossentropy(labels, tf.transpose(logits[:, :n]), from_logits=True)
+        return (tf.reduce_mean(loss_en) + tf.reduce_mean(loss_ko)) / 2
+    return loss
+
+
+def set_precision(mixed=False):
+    """mixed=True 이면 CPU 에서 지원되는 bfloat16 혼합 정밀도 정책을 사용한다."""
+    mixed_precision.set_global_policy("mixed_bfloat16" if mixed else "float32")
+
+
+def similarity_model(enc_en, enc_ko):
+    """(영어, 한국어) → cosine 유사도. TFLite 로 내보내는 추론용 모델."""
+    in_en = layers.Input(shape=(MAX_LEN_EN,), dtype="int32")
+    in_ko = layers.Input(shape=(MAX_LEN_KO,), dtype="int32")
+    sim = layers.Dot(axes=1, normalize=True, dtype="float32")([enc_en(in_en), enc_ko(in_ko)])
+    return models.Model([in_en, in_ko], sim)
+
+
+def build_dual_encoder(en_vocab, ko_vocab, jit_compile=False, objective="infonce", temperature=TEMPERATURE,
+                       hard_negatives=False, encoders=None):
+    """학습용 모델과 두 인코더를 만든다.
+
+    objective="margin" : 기존 positive-only margin 손실 (유사도 모델을 그대로 학습)
+    objective="infonce": 배치 전체 유사도 행렬 + softmax (in-batch negatives)
+    hard_negatives=True 이면 세 번째 입력(mining 된 한국어 오답)을 받는다 (infonce 전용).
+    encoders=(enc_en, enc_ko) 를 넘기면 이전 라운드의 인코더 가중치를 이어서 학습한다.
+    반환: (학습용 모델, 영어 인코더, 한국어 인코더)
+    """
+    if encoders is None:
+        encoders = build_encoder(en_vocab, MAX_LEN_EN), build_encoder(ko_vocab, MAX_LEN_KO)
+    enc_en, enc_ko = encoders
+
+    if objective == "margin":
+        if hard_negatives:
+            raise ValueError("hard negatives require the infonce objective")
+        model = similarity_model(enc_en, enc_ko)
+        model.compile(optimizer="adam", loss=contrastive_loss, jit_compile=jit_compile)
+        return model, enc_en, enc_ko
+
+    in_en = layers.Input(shape=(MAX_LEN_EN,), dtype="int32")
+    in_ko = layers.Input(shape=(MAX_LEN_KO,), dtype="int32")
+    inputs, outputs = [in_en, in_ko], [enc_en(in_en), enc_ko(in_ko)]
+    if hard_negatives:
+        in_hard = layers.Input(shape=(MAX_LEN_KO,), dtype="int32")
+        inputs.append(in_hard)
+        outputs.append(enc_ko(in_hard))
+    both = layers.Concatenate(axis=1, dtype="float32")(outputs)
+    model = models.Model(inputs, both)
+    model.compile(optimizer="adam", loss=info_nce_loss(temperature, hard_negatives), jit_compile=jit_compile)
+    return model, enc_en, enc_ko
+
+
+def mine_hard_negatives(enc_en, enc_ko, x_en, x_ko, top_k=HARD_TOP_K, chunk=4096, seed=42):
+    """학습 영어 이름마다 한국어 임베딩 인덱스에서 점수가 높은 오답 하나를 고른다.
+
+    한국어 카탈로그(중복 제거)를 한 번 임베딩하고, 영어 임베딩을 chunk 단위 행렬곱 +
+    argpartition 으로 top-k 를 구한 뒤 정답을 제외한 후보 중 하나를 무작위로 뽑는다.
+    (항상 1등 오답만 쓰면 동음/동의 이름 같은 사실상 정답을 negative 로 학습할 위험이 있음)
+    """
+    catalog, target = np.unique(x_ko, axis=0, return_inverse=True)
+    target = target.reshape(-1)
+    emb_ko = enc_ko.predict(catalog, batch_size=4096, verbose=0)
+    emb_en = enc_en.predict(x_en, batch_size=4096, verbose=0)
+    k = min(top_k, len(catalog) - 1)
+    if k < 1:
+        raise ValueError("need at least two distinct korean names to mine negatives")
+
+    rng = np.random.default_rng(seed)
+    hard = np.empty(len(x_en), dtype=np.int64)
+    for start in range(0, len(emb_en), chunk):
+        sims = emb_en[start:start + chunk] @ emb_ko.T
+        rows = np.arange(len(sims))
+        sims[rows, target[start:start + chunk]] = -np.inf  # 정답 제외
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        hard[start:start + chunk] = top[rows, rng.integers(0, k, len(sims))]
+    return catalog[hard]
+
+
+class RecallAtK(tf.keras.callbacks.Callback):
+    """epoch 마다 검증 세트 영어 이름으로 검증 세트 한국어 이름 카탈로그를 검색해
+    recall@k 를 logs(val_recall@k) 에 기록한다."""
+
+    def __init__(self, x_en, x_ko, enc_en, enc_ko, ks=RECALL_KS, chunk=4096):
+        super().__init__()
+        # 같은 한국어 이름은 카탈로그에서 한 번만
+        self.catalog, self.target = np.unique(x_ko, axis=0, return_inverse=True)
+        self.target = self.target.reshape(-1)
+        self.x_en = x_en
+        self.enc_en, self.enc_ko = enc_en, enc_ko
+        self.ks = ks
+        self.chunk = chunk
+
+    def on_epoch_end(self, epoch, logs=None):
+        emb_ko = self.enc_ko.predict(self.catalog, batch_size=4096, verbose=0)
+        emb_en = self.enc_en.predict(self.x_en, batch_size=4096, verbose=0)
+        max_k = min(max(self.ks), len(self.catalog))
+        hits = np.zeros(len(self.ks))
+        for start in range(0, len(emb_en), self.chunk):
+            sims = emb_en[start:start + self.chunk] @ emb_ko.T
+            target = self.target[start:start + self.chunk]
+            # 정답보다 점수가 높은 후보 수 = 정답 순위(0부터)
+            rank = (sims > sims[np.arange(len(target)), target][:, None]).sum(axis=1)
+            hits += [(rank < min(k, max_k)).sum() for k in self.ks]
+        recalls = hits / len(emb_en)
+        if logs is not None:
+            for k, r in zip(self.ks, recalls):
+                logs[f"val_recall@{k}"] = float(r)
+        print(" - " + " - ".join(f"val_recall@{k}: {r:.4f}" for k, r in zip(self.ks, recalls)))
+
+
+def export_model(model, name):
+    """keras 모델과 TFLite 변환본을 MODEL_DIR 에 저장한다."""
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    keras_path = os.path.join(MODEL_DIR, f"{name}.keras")
+    model.save(keras_path)
+    print("[INFO] saved", keras_path)
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    tflite_model = converter.convert()
+    tflite_path = os.path.join(MODEL_DIR, f"{name}.tflite")
+    with open(tflite_path, "wb") as f:
+        f.write(tflite_model)
+    print(f"[DONE] model exported to {tflite_path}")
+
+
+def export_numpy(enc_en, enc_ko, en_charset, ko_charset, name, sample_en, sample_ko, atol=1e-4):
+    """두 타워를 NumPy 추론용 .npz 로 내보내고 keras 출력과의 오차를 확인한다.
+
+    임시 파일에 먼저 쓰고 두 타워 모두 오차가 atol 이하일 때만 제자리로 옮긴다.
+    하나라도 넘으면 임시 파일을 지우고 RuntimeError (기존 .npz 는 그대로 남는다).
+    """
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    written = []
+    try:
+        for suffix, enc, charset, max_len, sample, lower in (
+            ("en", enc_en, en_charset, MAX_LEN_EN, sample_en, True),
+            ("ko", enc_ko, ko_charset, MAX_LEN_KO, sample_ko, False),
+        ):
+            path = os.path.join(MODEL_DIR, f"{name}_{suffix}.npz")
+            tmp = os.path.join(MODEL_DIR, f"{name}_{suffix}.tmp.npz")
+            export_encoder(enc, charset, max_len, tmp, lower=lower)
+            written.append((tmp, path))
+            diff = max_abs_diff(enc, NumpyEncoder.load(tmp), sample)
+            if diff > atol:
+                raise RuntimeError(f"numpy export of {path} does not match keras (max abs diff {diff:.2e} > {atol:.0e})")
+            print(f"[INFO] verified {path} (max abs diff vs keras: {diff:.2e} OK)")
+    except BaseException:
+        for tmp, _ in written:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        raise
+    for tmp, path in written:
+        os.replace(tmp, path)
+        print(f"[INFO] saved {path}")
+
+
+# -------------------------------------------------
+# 벤치마크
+# -------------------------------------------------
+class EpochTimer(tf.keras.callbacks.Callback):
+    def on_train_begin(self, logs=None):
+        self.times = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.times.append(time.perf_counter() - self._start)
+
+
+BENCHMARK_CONFIGS = [
+    # 기존 파이프라인: batch(256).prefetch(2), 셔플/캐시 없음
+    {"name": "baseline", "cache": False, "shuffle_buffer": 0, "prefetch": 2},
+    {"name": "tuned", "cache": True, "shuffle_buffer": SHUFFLE_BUFFER, "prefetch": AUTOTUNE},
+    {"name": "tuned+jit", "cache": True, "shuffle_buffer": SHUFFLE_BUFFER, "prefetch": AUTOTUNE, "jit_compile": True},
+    {"name": "tuned+bf16", "cache": True, "shuffle_buffer": SHUFFLE_BUFFER, "prefetch": AUTOTUNE, "mixed": True},
+]
+
+
+def benchmark(x_en, x_ko, en_vocab, ko_vocab, configs=BENCHMARK_CONFIGS, epochs=2, batch_size=BATCH_SIZE):
+    """설정별로 새 모델을 학습해 examples/sec 와 epoch 당 시간을 측정한다.
+
+    첫 epoch 는 그래프 trace/컴파일 비용이 섞이므로 이후 epoch 의 평균을 함께 보고한다.
+    """
+    results = []
+    for cfg in configs:
+        set_precision(cfg.get("mixed", False))
+        try:
+            ds = make_dataset(x_en, x_ko, batch_size=batch_size, cache=cfg.get("cache", True),
+                              shuffle_buffer=cfg.get("shuffle_buffer", SHUFFLE_BUFFER),
+                              prefetch=cfg.get("prefetch", AUTOTUNE))
+            model, _, _ = build_dual_encoder(en_vocab, ko_vocab, jit_compile=cfg.get("jit_compile", False))
+            timer = EpochTimer()
+            model.fit(ds, epochs=epochs, verbose=0, callbacks=[timer])
+        except (tf.errors.OpError, ValueError) as e:
+            # XLA/bf16 미지원 환경 등
+            print(f"[WARN] {cfg['name']} skipped: {e}")
+            continue
+        finally:
+            set_precision(False)
+
+        n_examples = (len(x_en) // batch_size) * batch_size
+        steady = timer.times[1:] or timer.times
+        epoch_sec = sum(steady) / len(steady)
+        results.append({
+            "name": cfg["name"],
+            "first_epoch_sec": round(timer.times[0], 3),
+            "epoch_sec": round(epoch_sec, 3),
+            "examples_per_sec": round(n_examples / epoch_sec, 1),
+        })
+
+    print(f"{'config':<14}{'1st epoch(s)':>14}{'epoch(s)':>10}{'examples/s':>14}")
+    for r in results:
+        print(f"{r['name']:<14}{r['first_epoch_sec']:>14.3f}{r['epoch_sec']:>10.3f}{r['examples_per_sec']:>14,.1f}")
+    return results
+
+
+def run(x_en, x_ko, en_charset, ko_charset, name, epochs=EPOCHS, jit_compile=False, mixed=False,
+        objective="infonce", temperature=TEMPERATURE, mining_rounds=0, mining_epochs=None, hard_top_k=HARD_TOP_K):
+    """학습/검증 분리 → 학습 → (hard negative mining 라운드) → 내보내기까지의 공통 흐름."""
+    en_vocab, ko_vocab = len(en_charset) + 2, len(ko_charset) + 2
+    # retrieval_eval.py 와 같은 분할 (name_dataset.split_indices)
+    train_idx, val_idx = split_indices(len(x_en))
+    X_train_en, X_val_en, X_train_ko, X_val_ko = x_en[train_idx], x_en[val_idx], x_ko[train_idx], x_ko[val_idx]
+    train_ds = make_dataset(X_train_en, X_train_ko)
+    val_ds = make_dataset(X_val_en, X_val_ko, training=False)
+
+    print("[INFO] building model...")
+    set_precision(mixed)
+    model, enc_en, enc_ko = build_dual_encoder(en_vocab, ko_vocab, jit_compile=jit_compile,
+                                               objective=objective, temperature=temperature)
+
+    print(f"[INFO] training ({objective})...")
+    recall = RecallAtK(X_val_en, X_val_ko, enc_en, enc_ko)
+    model.fit(train_ds, validation_data=val_ds, epochs=epochs, verbose=1, callbacks=[recall])
+
+    for r in range(mining_rounds):
+        print(f"[INFO] mining hard negatives (round {r + 1}/{mining_rounds})...")
+        X_hard = mine_hard_negatives(enc_en, enc_ko, X_train_en, X_train_ko, top_k=hard_top_k)
+        hard_ds = make_dataset(X_train_en, X_train_ko, x_hard=X_hard)
+        model, _, _ = build_dual_encoder(en_vocab, ko_vocab, jit_compile=jit_compile, objective=objective,
+                                         temperature=temperature, hard_negatives=True, encoders=(enc_en, enc_ko))
+        model.fit(hard_ds, epochs=mining_epochs or epochs, verbose=1, callbacks=[recall])
+    set_precision(False)
+
+    export_numpy(enc_en, enc_ko, en_charset, ko_charset, name, X_val_en[:1024], X_val_ko[:1024])
+    sim_model = similarity_model(enc_en, enc_ko)
+    export_model(sim_model, name)
+    return sim_model
+
+
+def add_cli_args(parser):
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--jit", action="store_true", help="XLA jit_compile 사용")
+    parser.add_argument("--mixed-precision", action="store_true", help="bfloat16 혼합 정밀도 (CPU 지원 시)")
+    parser.add_argument("--objective", choices=["infonce", "margin"], default="infonce",
+                        help="infonce: in-batch negatives softmax, margin: 기존 positive-only 손실")
+    parser.add_argument("--temperature", type=float, default=TEMPERATURE, help="InfoNCE softmax 온도")
+    parser.add_argument("--mining-rounds", type=int, default=0,
+                        help="1차 학습 후 hard negative mining → 재학습 라운드 수 (infonce 전용)")
+    parser.add_argument("--mining-epochs", type=int, default=None, help="mining 라운드당 epoch (기본: --epochs)")
+    parser.add_argument("--hard-top-k", type=int, default=HARD_TOP_K, help="오답 후보를 뽑을 상위 k")
+    parser.add_argument("--benchmark", action="store_true", help="입력 파이프라인/컴파일 설정별 처리량만 측정")
+    parser.add_argument("--benchmark-epochs", type=int, default=2)
+    return parser
+
+
+def main(args, x_en, x_ko, en_charset, ko_charset, name):
+    if args.benchmark:
+        return benchmark(x_en, x_ko, len(en_charset) + 2, len(ko_charset) + 2, epochs=args.benchmark_epochs)
+    return run(x_en, x_ko, en_charset, ko_charset, name, epochs=args.epochs,
+               jit_compile=args.jit, mixed=args.mixed_precision,
+               objective=args.objective, temperature=args.temperature, mining_rounds=args.mining_rounds,
+               mining_epochs=args.mining_epochs, hard_top_k=args.hard_top_k)
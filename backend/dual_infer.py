@@ -1,60 +1,235 @@
-"""TFLite Dual Encoder 추론 유틸리티"""
-import os, numpy as np, heapq
-import tflite_runtime.interpreter as tflite
-from .train_dual_encoder import pad, encode, en_charset, ko_charset, MAX_LEN_EN, MAX_LEN_KO
-from sqlalchemy.orm import Session
-from db import SessionLocal
-from models import NameTrend
+"""Dual Encoder 추론 유틸리티
+
+models/dual_encoder_{en,ko}.npz (numpy_encoder 로 내보낸 가중치)가 있으면 NumPy 만으로 추론한다.
+없으면 기존 TFLite 모델(MODEL_TFLITE)을 사용한다.
+모델(인코더) + 한국어 이름 카탈로그 + 카탈로그 임베딩을 Recommender 하나로 묶어
+model_registry 가 버전별로 교체할 수 있게 한다.
+"""
+import os
+import time
+
+import numpy as np
+
+from metrics import stage
+from numpy_encoder import NumpyEncoder
+from phonetic import PREFILTER_CANDIDATES, PhoneticIndex
 
 MODEL_PATH = os.getenv("MODEL_TFLITE", "models/dual_encoder.tflite")
+MODEL_NUMPY_EN = os.getenv("MODEL_NUMPY_EN", "models/dual_encoder_en.npz")
+MODEL_NUMPY_KO = os.getenv("MODEL_NUMPY_KO", "models/dual_encoder_ko.npz")
+# 1단계 발음 후보 생성 사용 여부 (카탈로그가 후보 수보다 작으면 어차피 전체 스캔)
+PHONETIC_PREFILTER = os.getenv("PHONETIC_PREFILTER", "1") == "1"
+# 재정렬: 점수 상위 RERANK_POOL 개 이름 안에서 MMR (MMR_LAMBDA=1 이면 점수 순 상위 k 개)
+RERANK_POOL = int(os.getenv("RERANK_POOL", "50"))
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+# 재정렬 전까지 이미 이 시간(ms)을 넘겼으면 MMR 은 건너뛰고 점수 순 상위 k 개를 반환
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "20"))
+
+
+class Catalog:
+    """추천 대상 한국어 이름 목록 (열 단위 배열).
+
+    name_trends 는 이름마다 연도/성별/지역 행이 여러 개이므로 korean_name 당 한 항목으로 합쳐 쓴다:
+    eraScore 는 행 중 최고값, gender 는 한 성별뿐이면 그 값 아니면 "unisex", meaning 은 비어 있지 않은 첫 값.
+    """
+
+    FIELDS = ("korean_name", "meaning", "era_score", "gender")
+
+    def __init__(self, korean_name, meaning, era_score, gender):
+        self.korean_name = np.asarray(korean_name, dtype=object)
+        self.meaning = np.asarray(meaning, dtype=object)
+        self.era_score = np.asarray(era_score, dtype=np.float32)
+        self.gender = np.asarray(gender, dtype=object)
+
+    def __len__(self):
+        return len(self.korean_name)
+
+    @classmethod
+    def from_db(cls):
+        from db import SessionLocal
+        from models import NameTrend
+
+        with SessionLocal() as db:
+            rows = db.query(NameTrend.korean_name, NameTrend.meaning, NameTrend.trend_score, NameTrend.gender).all()
+        return (cls(*zip(*rows)) if rows else cls([], [], [], [])).by_name()[0]
+
+    def by_name(self):
+        """korean_name 당 한 항목으로 합친 (Catalog, 각 이름의 첫 행 번호). 이미 고유하면 자기 자신."""
+        names, first, inverse = np.unique(self.korean_name.astype(str), return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        if len(names) == len(self):
+            return self, np.arange(len(self))
+        order = np.argsort(first, kind="stable")  # 카탈로그에 처음 나온 순서 유지
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        group = rank[inverse]
+
+        era_score = np.full(len(names), -np.inf, dtype=np.float32)
+        np.maximum.at(era_score, group, self.era_score)
+        genders, g = np.unique(self.gender.astype(str), return_inverse=True)
+        seen = np.zeros((len(names), len(genders)), dtype=bool)
+        seen[group, g.reshape(-1)] = True
+        gender = np.where(seen.sum(axis=1) == 1, genders[seen.argmax(axis=1)], "unisex").astype(object)
+        meaning = np.full(len(names), None, dtype=object)
+        has = np.flatnonzero([isinstance(m, str) and bool(m) for m in self.meaning])
+        named, at = np.unique(group[has], return_index=True)
+        meaning[named] = self.meaning[has[at]]
+        first = first[order]
+        return Catalog(self.korean_name[first], meaning, era_score, gender), first
+
+    def entry(self, i):
+        return {
+            "koreanName": self.korean_name[i],
+            "meaning": self.meaning[i],
+            "eraScore": round(float(self.era_score[i]), 2),
+            "gender": self.gender[i],
+        }
+
+
+def mmr(embeddings, relevance, k, lam=MMR_LAMBDA):
+    """Maximal Marginal Relevance 로 k 개를 고른 위치 번호.
+
+    relevance 는 내림차순 정렬되어 있어야 한다 (첫 번째는 항상 선택).
+    후보끼리 유사도 행렬을 한 번 계산하고, 고를 때마다 "이미 고른 것과의 최대 유사도"만 갱신한다.
+    """
+    k = min(k, len(relevance))
+    if lam >= 1.0 or k <= 1:
+        return np.arange(k)
+    pair = embeddings @ embeddings.T
+    chosen = [0]
+    picked = np.zeros(len(relevance), dtype=bool)
+    picked[0] = True
+    max_sim = pair[0].copy()
+    for _ in range(1, k):
+        score = lam * relevance - (1.0 - lam) * max_sim
+        score[picked] = -np.inf
+        i = int(np.argmax(score))
+        chosen.append(i)
+        picked[i] = True
+        np.maximum(max_sim, pair[i], out=max_sim)
+    return np.array(chosen)
+
+
+class Recommender:
+    """영어 이름 임베딩 함수 + 카탈로그 임베딩으로 top-k 한국어 이름을 고른다.
+
+    카탈로그는 이름 단위로 합쳐 두므로(Catalog.by_name) 한 이름에 임베딩이 하나다.
+    prefilter(PhoneticIndex)가 있으면 발음이 가까운 후보 이름만 dense 점수를 계산하고,
+    점수 상위 RERANK_POOL 개 안에서 MMR 로 서로 덜 비슷한 이름을 고른다.
+    """
+
+    def __init__(self, embed_english, embeddings_ko, catalog, prefilter=None):
+        # 행 단위 카탈로그(이전 버전 index.npz 등)는 이름 단위로 합친다 (같은 이름이면 임베딩도 같다)
+        catalog, first = catalog.by_name()
+        if len(first) != len(embeddings_ko):
+            embeddings_ko = embeddings_ko[first]
+        self.embed_english = embed_english
+        self.embeddings_ko = embeddings_ko
+        self.catalog = catalog
+        if prefilter is None and PHONETIC_PREFILTER and len(catalog) > PREFILTER_CANDIDATES:
+            prefilter = PhoneticIndex(catalog.korean_name)
+        self.prefilter = prefilter
+
+    def recommend(self, english_name: str, k: int = 3, n_candidates: int = PREFILTER_CANDIDATES):
+        start = time.perf_counter()
+        # compute english embedding
+        emb_en = self.embed_english(english_name)
+
+        with stage("prefilter"):
+            rows = self.prefilter.candidates(english_name, n_candidates) if self.prefilter else None
+        if rows is not None and len(rows) >= k:
+            with stage("similarity"):
+                sims = self.embeddings_ko[rows] @ emb_en
+        else:
+            # 발음 후보가 k 개보다 적으면 전체 스캔
+            rows = None
+            with stage("similarity"):
+                sims = self.embeddings_ko @ emb_en  # cosine since normalized
+        with stage("topk"):
+            pool = self._pool(sims, k)
+        relevance = sims[pool]
+        top_idx = pool if rows is None else rows[pool]
+        with stage("rerank"):
+            if len(top_idx) > k and (time.perf_counter() - start) * 1000 < RERANK_BUDGET_MS:
+                top_idx = top_idx[mmr(self.embeddings_ko[top_idx], relevance, k, MMR_LAMBDA)]
+            else:
+                top_idx = top_idx[:k]
+        return [self.catalog.entry(i) for i in top_idx]
+
+    @staticmethod
+    def _pool(sims, k):
+        """점수 상위 max(RERANK_POOL, k) 개의 sims 위치 번호 (점수 내림차순)."""
+        n = min(len(sims), max(RERANK_POOL, k))
+        top = np.argpartition(-sims, n - 1)[:n] if n < len(sims) else np.arange(len(sims))
+        return top[np.argsort(-sims[top], kind="stable")]
+
+
+def load_numpy(en_path=MODEL_NUMPY_EN, ko_path=MODEL_NUMPY_KO, catalog=None, embeddings_ko=None):
+    """TensorFlow/TFLite 없이 NumPy 배치 순전파를 쓰는 Recommender."""
+    encoder_en = NumpyEncoder.load(en_path)
+    catalog = catalog if catalog is not None else Catalog.from_db()
+    if embeddings_ko is None:
+        embeddings_ko = NumpyEncoder.load(ko_path).embed(list(catalog.korean_name))
+
+    def embed_english(english_name: str):
+        with stage("tokenize"):
+            ids = encoder_en.tokenize([english_name])
+        with stage("encode"):
+            return encoder_en(ids)[0]
+
+    return Recommender(embed_english, embeddings_ko, catalog)
+
+
+def load_tflite(model_path=MODEL_PATH, catalog=None):
+    import tflite_runtime.interpreter as tflite
+    from train_dual_encoder import pad, encode, en_charset, ko_charset, MAX_LEN_EN, MAX_LEN_KO
+
+    interpreter = tflite.Interpreter(model_path=model_path)
+    interpreter.allocate_tensors()
+
+    input_en_idx = interpreter.get_input_details()[0]["index"]
+    input_ko_idx = interpreter.get_input_details()[1]["index"]
+    output_idx = interpreter.get_output_details()[0]["index"]
+
+    catalog = catalog if catalog is not None else Catalog.from_db()
+    ko_vecs = np.array([pad(encode(name, ko_charset, MAX_LEN_KO), MAX_LEN_KO) for name in catalog.korean_name],
+                       dtype=np.int32)
+
+    # Encode korean names once
+    embeddings_ko = []
+    for vec in ko_vecs:
+        interpreter.set_tensor(input_en_idx, np.zeros((1, MAX_LEN_EN), np.int32))
+        interpreter.set_tensor(input_ko_idx, vec.reshape(1, -1))
+        interpreter.invoke()
+        embeddings_ko.append(interpreter.get_tensor(output_idx)[0])
+    embeddings_ko = np.vstack(embeddings_ko)
+
+    def embed_english(english_name: str):
+        with stage("tokenize"):
+            en_vec = np.array([pad(encode(english_name.lower(), en_charset, MAX_LEN_EN), MAX_LEN_EN)], dtype=np.int32)
+        with stage("encode"):
+            interpreter.set_tensor(input_en_idx, en_vec)
+            interpreter.set_tensor(input_ko_idx, np.zeros((1, MAX_LEN_KO), np.int32))
+            interpreter.invoke()
+            return interpreter.get_tensor(output_idx)[0]
 
-interpreter = tflite.Interpreter(model_path=MODEL_PATH)
-interpreter.allocate_tensors()
+    return Recommender(embed_english, embeddings_ko, catalog)
 
-input_en_idx = interpreter.get_input_details()[0]["index"]
-input_ko_idx = interpreter.get_input_details()[1]["index"]
-output_idx = interpreter.get_output_details()[0]["index"]
 
-# Preload korean embeddings
-print("[INFO] caching korean embeddings...")
-with SessionLocal() as db:
-    all_kos = db.query(NameTrend).all()
+_default = None
 
-ko_vecs = []
-ko_entries = []
-for row in all_kos:
-    vec = pad(encode(row.korean_name, ko_charset, MAX_LEN_KO), MAX_LEN_KO)
-    ko_vecs.append(vec)
-    ko_entries.append(row)
-ko_vecs = np.array(ko_vecs, dtype=np.int32)
 
-# Encode korean names once
-embeddings_ko = []
-for vec in ko_vecs:
-    interpreter.set_tensor(input_en_idx, np.zeros((1, MAX_LEN_EN), np.int32))
-    interpreter.set_tensor(input_ko_idx, vec.reshape(1, -1))
-    interpreter.invoke()
-    embeddings_ko.append(interpreter.get_tensor(output_idx)[0])
-embeddings_ko = np.vstack(embeddings_ko)
+def get_default():
+    """환경변수 경로의 기본 모델을 처음 호출될 때 한 번만 로드한다."""
+    global _default
+    if _default is None:
+        print("[INFO] caching korean embeddings...")
+        if os.path.exists(MODEL_NUMPY_EN) and os.path.exists(MODEL_NUMPY_KO):
+            _default = load_numpy()
+        else:
+            _default = load_tflite()
+    return _default
 
 
 def recommend(english_name: str, k: int = 3):
-    en_vec = np.array([pad(encode(english_name.lower(), en_charset, MAX_LEN_EN), MAX_LEN_EN)], dtype=np.int32)
-    # compute english embedding
-    interpreter.set_tensor(input_en_idx, en_vec)
-    interpreter.set_tensor(input_ko_idx, np.zeros((1, MAX_LEN_KO), np.int32))
-    interpreter.invoke()
-    emb_en = interpreter.get_tensor(output_idx)[0]
-
-    sims = embeddings_ko @ emb_en  # cosine since normalized
-    top_idx = heapq.nlargest(k, range(len(sims)), sims.take)
-    results = []
-    for i in top_idx:
-        row = ko_entries[i]
-        results.append({
-            "koreanName": row.korean_name,
-            "meaning": row.meaning,
-            "eraScore": round(float(row.trend_score), 2),
-            "gender": row.gender,
-        })
-    return results 
\ No newline at end of file
+    return get_default().recommend(english_name, k)
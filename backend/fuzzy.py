@@ -0,0 +1,216 @@
+"""오타 허용 영어 이름 조회 (trigram 역색인 + 제한된 편집 거리)
+
+"Jonathon", "Kathrine" 처럼 name_trends 에 정확히 없는 입력을 알려진 표준 이름으로 바꾼다.
+어휘(suggest.load_vocabulary)의 소문자 이름마다 양끝을 채운 trigram 역색인을 만들고,
+q-gram 보조정리(편집 1회는 trigram 을 최대 4개까지 바꾼다, 인접 전치 포함)와 길이 차이로
+후보를 걸러낸 뒤 공통 trigram 이 많은 상위 FUZZY_VERIFY 개만 편집 거리를 계산한다.
+허용 거리는 1 부터 넓혀 가므로 흔한 한 글자 오타는 좁은 필터 한 번으로 끝난다.
+입력을 바꾸는 것(canonical)은 가장 가까운 이름이 하나뿐이고 충분히 흔한 이름일 때만이다.
+
+사용법:
+  python fuzzy.py            # 100만 개 합성 어휘로 오타 조회 지연시간(p50/p99) 측정
+"""
+import os
+
+import numpy as np
+
+from suggest import SUGGEST_REFRESH_S, IndexCache, load_vocabulary
+
+FUZZY_LIMIT = 5
+# 입력 길이별 허용 편집 거리: 3자 미만은 정확히 일치할 때만, 7자 미만은 1, 그 이상은 2
+FUZZY_MAX_DISTANCE = int(os.getenv("FUZZY_MAX_DISTANCE", "2"))
+# 필터를 통과한 후보가 이보다 많으면 공통 trigram 이 많은 순으로 이만큼만 편집 거리를 계산한다
+FUZZY_VERIFY = int(os.getenv("FUZZY_VERIFY", "200"))
+# 어휘의 이 비율보다 많은 이름에 나오는 trigram 은 후보 생성에 쓰지 않는다
+FUZZY_COMMON_GRAM = float(os.getenv("FUZZY_COMMON_GRAM", "0.01"))
+# 어휘 로드(DB)에 실패하면 이 시간(초) 동안은 다시 시도하지 않고 오타 보정 없이 응답한다
+FUZZY_RETRY_S = float(os.getenv("FUZZY_RETRY_S", "60"))
+# 입력을 바꿀 이름은 인기도가 어휘의 이 백분위수 이상이어야 한다 (드문 표기 "Alice3" 등으로 바꾸지 않게)
+FUZZY_MIN_POPULARITY_PCT = float(os.getenv("FUZZY_MIN_POPULARITY_PCT", "50"))
+
+
+def max_distance(length, cap=FUZZY_MAX_DISTANCE):
+    if length < 3:
+        return 0
+    return min(cap, 1 if length < 7 else 2)
+
+
+def trigrams(key: str):
+    padded = f"^^{key}$$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, bound: int) -> int:
+    """인접 전치를 포함한 편집 거리(OSA). bound 를 넘으면 bound + 1 을 반환한다."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = ca != cb
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > bound:
+            return bound + 1
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= bound else bound + 1
+
+
+def within_one(a: str, b: str) -> bool:
+    """edit_distance(a, b, 1) <= 1 의 빠른 판정 (치환/삽입/삭제/인접 전치 1회)."""
+    if len(a) < len(b):
+        a, b = b, a
+    if len(a) - len(b) > 1:
+        return False
+    i = 0
+    while i < len(b) and a[i] == b[i]:
+        i += 1
+    if len(a) != len(b):
+        return a[i + 1:] == b[i:]
+    if i == len(a):
+        return True
+    if a[i + 1:] == b[i + 1:]:
+        return True
+    return i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+
+
+class FuzzyIndex:
+    """영어 이름 어휘의 trigram 역색인. 대소문자만 다른 이름은 인기도가 높은 표기 하나로 묶는다."""
+
+    def __init__(self, names, popularity):
+        best = {}
+        for name, pop in zip(names, popularity):
+            name = str(name).strip()
+            key = name.lower()
+            if key and (key not in best or pop > best[key][1]):
+                best[key] = (name, float(pop))
+        self.keys = list(best)
+        self.names = [best[k][0] for k in self.keys]
+        self.popularity = np.array([best[k][1] for k in self.keys], dtype=np.float32)
+        self.exact = {k: i for i, k in enumerate(self.keys)}
+
+        postings = {}
+        self.sizes = np.zeros(len(self.keys), dtype=np.int16)
+        self.lengths = np.array([len(k) for k in self.keys], dtype=np.int16)
+        for i, key in enumerate(self.keys):
+            grams = trigrams(key)
+            self.sizes[i] = len(grams)
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+        self.postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+        self.max_posting = max(1024, int(len(self.keys) * FUZZY_COMMON_GRAM))
+        self.min_popularity = (float(np.percentile(self.popularity, FUZZY_MIN_POPULARITY_PCT))
+                               if len(self.keys) else 0.0)
+
+    def lookup(self, english_name: str, limit: int = FUZZY_LIMIT, distance: int | None = None):
+        """입력과 편집 거리가 가까운 표준 이름 목록 [(name, distance), ...] (거리, 인기도 순).
+
+        정확히 일치하는 이름이 있으면 그 이름 하나만 돌려준다.
+        """
+        key = english_name.strip().lower()
+        i = self.exact.get(key)
+        if i is not None:
+            return [(self.names[i], 0)]
+        bound = max_distance(len(key)) if distance is None else distance
+        if bound <= 0:
+            return []
+
+        grams = trigrams(key)
+        hit = [self.postings[g] for g in grams if g in self.postings]
+        # 너무 흔한 trigram("^^j" 등)은 세지 않고, 그만큼 필터 기준을 낮춘다 (후보는 놓치지 않음)
+        rare = [p for p in hit if len(p) <= self.max_posting]
+        if not rare:
+            return []
+        ids, common = np.unique(np.concatenate(rare), return_counts=True)
+        common = common + (len(hit) - len(rare))
+        # 거리 1 부터 넓혀 가며 가장 가까운 거리에서 찾은 이름들을 돌려준다 (대부분의 오타는 1회 편집)
+        for d in range(1, bound + 1):
+            matches = self._verify(key, len(grams), ids, common, d)
+            if matches:
+                return [(self.names[i], dist) for dist, _, i in matches[:limit]]
+        return []
+
+    def _verify(self, key, n_grams, ids, common, bound):
+        # q-gram 필터: 거리 bound 안의 이름은 max(|A|, |B|) - 4 * bound 개 이상의 trigram 을 공유한다
+        need = np.maximum(self.sizes[ids], n_grams) - 4 * bound
+        keep = (common >= np.maximum(need, 1)) & (np.abs(self.lengths[ids] - len(key)) <= bound)
+        ids, common = ids[keep], common[keep]
+        if len(ids) > FUZZY_VERIFY:
+            top = np.argpartition(-common, FUZZY_VERIFY - 1)[:FUZZY_VERIFY]
+            ids = ids[top]
+
+        matches = []
+        keys = self.keys
+        if bound == 1:
+            matches = [(1, -self.popularity[i], i) for i in ids.tolist() if within_one(key, keys[i])]
+        else:
+            for i in ids.tolist():
+                d = edit_distance(key, keys[i], bound)
+                if d <= bound:
+                    matches.append((d, -self.popularity[i], i))
+        matches.sort()
+        return matches
+
+    def canonical(self, english_name: str):
+        """입력 대신 쓸 표준 이름 (바꾸지 않으면 None).
+
+        정확히 일치하면 그 표기. 아니면 가장 가까운 거리에서 인기도가 min_popularity 이상인 이름이
+        하나뿐일 때만 그 이름 (둘 이상이면 어느 쪽인지 모르므로 바꾸지 않는다).
+        """
+        matches = self.lookup(english_name)
+        if matches and matches[0][1] == 0:
+            return matches[0][0]
+        popular = [name for name, _ in matches if self.popularity[self.exact[name.lower()]] >= self.min_popularity]
+        return popular[0] if len(popular) == 1 else None
+
+    def __len__(self):
+        return len(self.keys)
+
+
+_cache = IndexCache(lambda: FuzzyIndex(*load_vocabulary()), "fuzzy", SUGGEST_REFRESH_S, FUZZY_RETRY_S)
+
+
+def get_index():
+    """FuzzyIndex 또는 None (DB 를 쓸 수 없으면 FUZZY_RETRY_S 뒤에 다시 시도, suggest.IndexCache 참고)."""
+    return _cache.get()
+
+
+if __name__ == "__main__":
+    import random
+    import string
+    import time
+
+    rnd = random.Random(0)
+    vocab = set()
+    while len(vocab) < 1_000_000:
+        vocab.add("".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 10))).title())
+    vocab = list(vocab)
+    t = time.perf_counter()
+    index = FuzzyIndex(vocab, [rnd.paretovariate(1.2) for _ in vocab])
+    print(f"[INFO] built {len(index):,} names in {time.perf_counter() - t:.2f}s ({len(index.postings):,} trigrams)")
+
+    def typo(word):
+        pos = rnd.randrange(len(word))
+        op = rnd.choice("sdit")
+        if op == "s":
+            return word[:pos] + rnd.choice(string.ascii_lowercase) + word[pos + 1:]
+        if op == "d" and len(word) > 3:
+            return word[:pos] + word[pos + 1:]
+        if op == "t" and pos + 1 < len(word):
+            return word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+        return word[:pos] + rnd.choice(string.ascii_lowercase) + word[pos:]
+
+    sample = rnd.sample(vocab, 5000)
+    lat, found = [], 0
+    for word in sample:
+        query = typo(word.lower())
+        t = time.perf_counter()
+        result = index.lookup(query)
+        lat.append(time.perf_counter() - t)
+        found += word in {n for n, _ in result}
+    lat = np.array(lat) * 1000
+    print(f"[DONE] p50={np.percentile(lat, 50):.4f}ms p99={np.percentile(lat, 99):.4f}ms "
+          f"max={lat.max():.4f}ms recall={found / len(sample):.4f}")
@@ -0,0 +1,160 @@
+"""원천 Excel 파일 증분 수집(ingestion) 매니페스트
+
+처리한 원천 파일의 SHA-256 과 파싱 결과(파티션 CSV)를 기록해 두고,
+다음 실행에서는 새로 추가되었거나 내용이 바뀐 파일만 다시 파싱한다.
+합계는 이전 값에 변경분만 더하고 빼서 갱신한다.
+매니페스트는 namespace 마다 별도 파일이라 여러 수집 스크립트를 동시에 돌려도 서로 덮어쓰지 않는다.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).parent / "data"
+MANIFEST_DIR = Path(os.getenv("INGEST_MANIFEST_DIR", DATA_DIR / "manifests"))
+PARTITION_DIR = Path(os.getenv("INGEST_PARTITION_DIR", DATA_DIR / "partitions"))
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-256 해시를 반환한다."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_key(path):
+    """data/ 기준 상대 경로(없으면 그대로)를 매니페스트 키로 사용한다."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(DATA_DIR.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+class IngestManifest:
+    """namespace(예: korea_boys, merge) 단위로 처리한 파일과 파티션을 관리한다."""
+
+    def __init__(self, namespace, manifest_dir=MANIFEST_DIR, partition_dir=PARTITION_DIR):
+        self.namespace = namespace
+        self.path = Path(manifest_dir) / f"{namespace}.json"
+        self.partition_dir = Path(partition_dir) / namespace
+        state = {"files": {}, "totals": None}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        self._garbage = set()
+        # 기록된 파티션 파일이 없어 증분 계산을 믿을 수 없으면 True (전체 다시 조립)
+        self.full_rebuild = False
+        self.state = state
+
+    @property
+    def files(self):
+        return self.state["files"]
+
+    def _read_partition(self, name):
+        path = self.partition_dir / name
+        if not path.exists():
+            return None
+        return pd.read_csv(path, encoding="utf-8")
+
+    def _drop_partition(self, name):
+        # 실제 삭제는 save() 시점까지 미룬다 (중간 실패 시 이전 상태 유지)
+        self._garbage.add(name)
+        return self._read_partition(name)
+
+    def _write_partition(self, name, df):
+        self.partition_dir.mkdir(parents=True, exist_ok=True)
+        df.to_csv(self.partition_dir / name, index=False, encoding="utf-8")
+
+    def sync(self, paths, parse_fn):
+        """paths 를 매니페스트와 비교해 변경분만 parse_fn 으로 다시 읽는다.
+
+        반환값: (frames, fresh, stale)
+          frames: {파일키: DataFrame} — 현재 유효한 모든 파일의 파티션
+          fresh : 이번 실행에서 새로 파싱한 파일키 목록
+          stale : {파일키: 이전 DataFrame} — 변경되었거나 삭제된 파일의 예전 파티션
+        기록된 파티션 파일이 사라졌으면 full_rebuild 가 True 가 되고 캐시된 합계는 버린다
+        (호출하는 쪽은 증분 대신 frames 전체로 결과를 다시 만들어야 한다).
+        """
+        frames, fresh, stale = {}, [], {}
+        seen = set()
+        for path in paths:
+            key = file_key(path)
+            seen.add(key)
+            digest = file_digest(path)
+            entry = self.files.get(key)
+            if entry and entry["sha256"] == digest:
+                df = self._read_partition(entry["partition"])
+                if df is not None:
+                    frames[key] = df
+                    continue
+            if entry:
+                self._drop_stale(key, stale)
+
+            df = parse_fn(path)
+            if df is None or df.empty:
+                continue
+            partition = f"{digest[:16]}.csv"
+            self._write_partition(partition, df)
+            self.files[key] = {"sha256": digest, "partition": partition, "rows": len(df)}
+            frames[key] = df
+            fresh.append(key)
+
+        # 원천 폴더에서 사라진 파일은 합계에서 빼야 한다
+        for key in set(self.files) - seen:
+            self._drop_stale(key, stale)
+        return frames, fresh, stale
+
+    def _drop_stale(self, key, stale):
+        old = self._drop_partition(self.files.pop(key)["partition"])
+        if old is not None:
+            stale[key] = old
+            return
+        # 예전 파티션이 없으면 무엇을 빼야 할지 모른다: 캐시된 합계와 증분 추가를 버리고 전체를 다시 만든다
+        self.full_rebuild = True
+        self.state["totals"] = None
+
+    def update_totals(self, frames, fresh, stale, by, value):
+        """이전 합계에 fresh 파티션을 더하고 stale 파티션을 빼서 새 합계를 만든다."""
+        prev = None
+        if self.state.get("totals"):
+            prev_df = self._read_partition(self.state["totals"])
+            if prev_df is not None:
+                prev = prev_df.set_index(by)[value]
+
+        if prev is None:
+            # 캐시된 합계가 없으면 전체 파티션으로 한 번만 계산
+            parts = [df.groupby(by)[value].sum() for df in frames.values()]
+        else:
+            parts = [prev]
+            parts += [frames[key].groupby(by)[value].sum() for key in fresh]
+            parts += [-df.groupby(by)[value].sum() for df in stale.values()]
+
+        if parts:
+            totals = pd.concat(parts).groupby(level=0).sum()
+            totals = totals[totals > 0]
+        else:
+            totals = pd.Series(dtype=float)
+        totals.index.name = by
+        totals.name = value
+
+        name = "_totals.csv"
+        self._write_partition(name, totals.reset_index())
+        self.state["totals"] = name
+        return totals
+
+    def save(self):
+        """이 namespace 의 매니페스트를 원자적으로 기록한다 (임시 파일 → os.replace)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+        live = {entry["partition"] for entry in self.files.values()}
+        for name in self._garbage - live:
+            (self.partition_dir / name).unlink(missing_ok=True)
+        self._garbage.clear()
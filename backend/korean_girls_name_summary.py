@@ -12,6 +12,9 @@ import seaborn as sns
 from pathlib import Path
 import warnings
 import re
+
+from ingest import IngestManifest, file_key
+
 warnings.filterwarnings('ignore')
 
 # 한글 폰트 설정 (matplotlib)
@@ -37,6 +40,8 @@ class KoreanGirlsNamesAnalyzer:
             '상위 출생신고이름현황(2024~2025) 여.xls'
         ]
         self.all_data = []
+        # 처리한 원천 파일/해시 기록 → 새로 추가되거나 바뀐 파일만 다시 파싱
+        self.manifest = IngestManifest('korea_girls')
         
     def read_excel_file(self, file_path):
         """
@@ -117,17 +122,18 @@ class KoreanGirlsNamesAnalyzer:
         """
         print("Excel 파일들을 읽는 중...")
         
-        # base_dir 내부의 모든 .xls 및 .xlsx 파일 검색
-        for file_path in sorted(self.base_dir.glob("*.xls*")):
-            if file_path.exists():
-                df = self.read_excel_file(file_path)
-                if df is not None and not df.empty:
-                    self.all_data.append(df)
-                    print(f"✓ {file_path} 읽기 완료: {len(df)}개 이름")
-                else:
-                    print(f"✗ {file_path} 읽기 실패 또는 빈 데이터")
-            else:
-                print(f"✗ {file_path} 파일을 찾을 수 없습니다")
+        files = sorted(self.base_dir.glob("*.xls*"))
+        self.frames, self.fresh_files, self.stale_files = self.manifest.sync(files, self.read_excel_file)
+        
+        for file_path in files:
+            key = file_key(file_path)
+            if key not in self.frames:
+                print(f"✗ {file_path} 읽기 실패 또는 빈 데이터")
+                continue
+            df = self.frames[key]
+            self.all_data.append(df)
+            status = "읽기 완료" if key in self.fresh_files else "변경 없음, 캐시 사용"
+            print(f"✓ {file_path} {status}: {len(df)}개 이름")
         
         if not self.all_data:
             raise ValueError("읽을 수 있는 파일이 없습니다. 파일 경로를 확인해주세요.")
@@ -142,8 +148,10 @@ class KoreanGirlsNamesAnalyzer:
         """
         print("\n전체 기간 랭킹을 생성하는 중...")
         
-        # 이름별 총 건수 계산
-        name_totals = self.combined_data.groupby('이름')['건수'].sum().reset_index()
+        # 이름별 총 건수: 이전 합계에 새로 추가/변경/삭제된 파일분만 반영
+        totals = self.manifest.update_totals(self.frames, self.fresh_files, self.stale_files, '이름', '건수')
+        self.manifest.save()
+        name_totals = totals.reset_index()
         name_totals = name_totals.sort_values('건수', ascending=False).reset_index(drop=True)
         name_totals['전체순위'] = range(1, len(name_totals) + 1)
         
@@ -0,0 +1,204 @@
+"""통합 CSV(data/names_dataset.csv) → name_trends 대량 적재
+
+merge_excel_to_csv.py 의 결과를 LOAD_CHUNK 행씩 읽어 name_trends 에 넣는다.
+  - trend_score   name_popularity.csv 의 era_score (korean_name, gender 기준, 없으면 0)
+  - pronunciation phonetic.romanize(korean_name)
+  - PostgreSQL(psycopg2)은 COPY FROM STDIN, 그 밖의 DB 는 Core executemany (ORM 객체를 만들지 않는다)
+  - 보조 인덱스(idx_english_name, idx_year, idx_english_year)는 적재 동안 지웠다가 끝난 뒤 한 번에 만든다
+모드
+  - append   기존 행 뒤에 추가 (기본)
+  - replace  name_trends 를 비우고 다시 적재
+  - upsert   임시 테이블에 적재한 뒤 (english_name, korean_name, gender, year) 가 같은 행은
+             trend_score/pronunciation 갱신, 없는 행만 추가 (이때는 매칭에 인덱스가 필요해 유지한다)
+
+사용법:
+  python load_trends.py                          # data/names_dataset.csv 추가 적재
+  python load_trends.py --mode replace
+  python load_trends.py --mode upsert --csv data/names_dataset.csv --chunk 100000
+"""
+import argparse
+import io
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, text
+
+from db import engine
+from models import NameTrend
+from phonetic import romanize
+
+DATA_DIR = Path(__file__).parent / "data"
+DATASET_CSV = os.getenv("DATA_CSV", str(DATA_DIR / "names_dataset.csv"))
+POPULARITY_CSV = os.getenv("NAME_POPULARITY_CSV", str(DATA_DIR / "name_popularity.csv"))
+LOAD_CHUNK = int(os.getenv("LOAD_CHUNK", "50000"))
+
+COLUMNS = ["english_name", "korean_name", "gender", "pronunciation", "year", "trend_score"]
+MATCH_KEY = ("english_name", "korean_name", "gender", "year")
+# 통합 CSV 의 gender 는 원천 폴더 이름(boys/girls)
+GENDERS = {"boys": "male", "girls": "female", "male": "male", "female": "female"}
+# 위치 인자 자리표시자 (DB-API paramstyle 별, 목록에 없으면 Core insert 로 처리)
+PLACEHOLDERS = {"qmark": "?", "format": "%s", "pyformat": "%s"}
+
+table = NameTrend.__table__
+
+
+def load_popularity(path=POPULARITY_CSV):
+    """korean_name, gender, trend_score(=era_score) 표"""
+    if not os.path.exists(path):
+        print(f"[WARN] {path} not found, trend_score will be 0")
+        return pd.DataFrame(columns=["korean_name", "gender", "trend_score"])
+    pop = pd.read_csv(path, usecols=["korean_name", "gender", "era_score"], dtype={"korean_name": str, "gender": str})
+    return pop.rename(columns={"era_score": "trend_score"}).drop_duplicates(["korean_name", "gender"])
+
+
+def read_chunks(path, popularity, chunk_size=LOAD_CHUNK):
+    """통합 CSV 를 name_trends 열 형식의 DataFrame 묶음으로 읽는다."""
+    pronunciation = {}
+    for df in pd.read_csv(path, usecols=["english_name", "korean_name", "gender", "year"],
+                          dtype={"english_name": str, "korean_name": str, "gender": str},
+                          chunksize=chunk_size):
+        df = df.dropna(subset=["english_name", "korean_name", "year"])
+        # merge_excel_to_csv 가 이미 공백을 정리하므로 열 길이만 맞춘다 (PostgreSQL 은 초과 시 오류)
+        df["english_name"] = df["english_name"].str.slice(0, 30)
+        df["korean_name"] = df["korean_name"].str.slice(0, 20)
+        df["gender"] = df["gender"].map(GENDERS).fillna("unknown")
+        df["year"] = df["year"].astype(int)
+        # 같은 이름이 여러 번 나오므로 고유 이름만 변환해 재사용
+        for name in df["korean_name"].unique():
+            if name not in pronunciation:
+                pronunciation[name] = romanize(name)[:50]
+        df["pronunciation"] = df["korean_name"].map(pronunciation)
+        df = df.merge(popularity, on=["korean_name", "gender"], how="left")
+        df["trend_score"] = df["trend_score"].fillna(0.0).astype(float)
+        yield df[COLUMNS]
+
+
+# ---------------- 대량 삽입 ----------------
+def copy_rows(conn, target, df):
+    """PostgreSQL COPY FROM STDIN (psycopg2)"""
+    buf = io.StringIO()
+    df.to_csv(buf, header=False, index=False)
+    buf.seek(0)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {target.name} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buf)
+    finally:
+        cursor.close()
+
+
+def insert_rows(conn, target, df):
+    """DB-API executemany 에 열 단위로 만든 튜플을 바로 넘긴다 (ORM 객체/dict 행을 만들지 않는다)"""
+    placeholder = PLACEHOLDERS.get(conn.dialect.paramstyle)
+    if placeholder is None:
+        conn.execute(target.insert(), df.to_dict("records"))
+        return
+    sql = f"INSERT INTO {target.name} ({', '.join(COLUMNS)}) VALUES ({', '.join([placeholder] * len(COLUMNS))})"
+    conn.exec_driver_sql(sql, list(zip(*(df[c].tolist() for c in COLUMNS))))
+
+
+def bulk_writer(conn):
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2":
+        return copy_rows
+    return insert_rows
+
+
+def load(conn, target, chunks):
+    write = bulk_writer(conn)
+    total = 0
+    for df in chunks:
+        write(conn, target, df)
+        total += len(df)
+        print(f"[INFO] {total:,} rows", end="\r", flush=True)
+    print()
+    return total
+
+
+# ---------------- upsert ----------------
+def staging_table():
+    """세션 동안만 존재하는 임시 테이블 (name_trends 와 같은 열, 인덱스 없음)"""
+    return Table(
+        "name_trends_staging", MetaData(),
+        Column("english_name", String(30)), Column("korean_name", String(20)), Column("gender", String(10)),
+        Column("pronunciation", String(50)), Column("year", Integer), Column("trend_score", Float),
+        prefixes=["TEMPORARY"],
+    )
+
+
+def merge_staging(conn, staging):
+    """임시 테이블 → name_trends: 같은 키는 갱신, 없는 키만 추가. (갱신 행 수, 추가 행 수)"""
+    match = " AND ".join(f"t.{c} = s.{c}" for c in MATCH_KEY)
+    keys = ", ".join(MATCH_KEY)
+    # 같은 키가 CSV 에 여러 번 있으면(지역만 다른 행 등) 한 행으로 합친다
+    source = (f"SELECT {keys}, MAX(pronunciation) AS pronunciation, MAX(trend_score) AS trend_score "
+              f"FROM {staging.name} GROUP BY {keys}")
+    updated = conn.execute(text(
+        f"UPDATE {table.name} AS t SET trend_score = s.trend_score, pronunciation = s.pronunciation "
+        f"FROM ({source}) AS s WHERE {match}"
+    )).rowcount
+    inserted = conn.execute(text(
+        f"INSERT INTO {table.name} ({', '.join(COLUMNS)}) "
+        f"SELECT {', '.join('s.' + c for c in COLUMNS)} FROM ({source}) AS s "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table.name} AS t WHERE {match})"
+    )).rowcount
+    return updated, inserted
+
+
+# ---------------- 인덱스 ----------------
+def drop_indexes(conn):
+    for index in table.indexes:
+        index.drop(conn, checkfirst=True)
+
+
+def create_indexes(conn):
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def run(path=DATASET_CSV, mode="append", chunk_size=LOAD_CHUNK, defer_indexes=True):
+    if not os.path.exists(path) or os.path.getsize(path) <= 1:
+        print(f"[SKIP] {path} is empty, run merge_excel_to_csv.py first")
+        return
+    table.create(engine, checkfirst=True)
+    chunks = read_chunks(path, load_popularity(), chunk_size)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            # 적재 연결에서만: 파생 데이터라 실패하면 다시 적재하면 된다
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        if mode == "replace":
+            conn.execute(table.delete())
+        if mode == "upsert":
+            staging = staging_table()
+            staging.create(conn)
+            loaded = load(conn, staging, chunks)
+            updated, inserted = merge_staging(conn, staging)
+            staging.drop(conn)
+            print(f"[DONE] {loaded:,} rows read, {updated:,} updated, {inserted:,} inserted "
+                  f"in {time.perf_counter() - start:.1f}s")
+            return
+        if defer_indexes:
+            drop_indexes(conn)
+        try:
+            loaded = load(conn, table, chunks)
+        finally:
+            if defer_indexes:
+                t = time.perf_counter()
+                create_indexes(conn)
+                print(f"[INFO] indexes rebuilt in {time.perf_counter() - t:.1f}s")
+    print(f"[DONE] {loaded:,} rows loaded ({mode}) in {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=DATASET_CSV)
+    parser.add_argument("--mode", choices=["append", "replace", "upsert"], default="append")
+    parser.add_argument("--chunk", type=int, default=LOAD_CHUNK, help="한 번에 읽고 넣는 행 수")
+    parser.add_argument("--keep-indexes", action="store_true", help="적재 중 인덱스를 유지 (적은 행 추가 시)")
+    args = parser.parse_args()
+    run(args.csv, args.mode, args.chunk, defer_indexes=not args.keep_indexes)
+
+
+if __name__ == "__main__":
+    main()
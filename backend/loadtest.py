@@ -0,0 +1,272 @@
+"""로컬 HTTP 부하 테스트 (운영 트래픽 재현용)
+
+영어 이름은 data/names_dataset.csv 에서 등장 빈도 순위로 Zipf 분포(순위^-s)를 따라 뽑는다.
+CSV 가 비어 있으면 name_trends 의 인기도 순 어휘(suggest.load_vocabulary)를 쓴다.
+  - 대상: Flask 앱을 프로세스 안에서 직접(test client) 또는 --url 로 띄워 둔 서버에 소켓으로
+          프로세스 안 대상은 저장 요청이 쌓이므로 임시 SQLite 를 쓴다 (--database-url 로 명시한 DB 만 사용)
+  - 요청 비율: --mix convert=0.7,save=0.2,history=0.1
+  - closed loop: 동시 사용자 N 명이 응답을 받자마자 다음 요청 (--concurrency 1 4 16 ...)
+  - open loop:   초당 --rate 건을 포아송 도착으로 보낸다. 지연시간은 예정 시각부터 재므로
+                 서버가 밀리면 대기 시간까지 포함된다 (coordinated omission 방지)
+동시성(또는 도착률)별 처리량, p50/p90/p99, 오류율을 표로 출력하고 --out 으로 JSON 저장한다.
+
+사용법:
+  python loadtest.py --concurrency 1 2 4 8 16 32 --duration 10          # 처리량-동시성 곡선
+  python loadtest.py --url http://127.0.0.1:5001 --rate 50 100 200       # open loop, 실제 서버
+  python loadtest.py --mix convert=1 --zipf-s 1.2 --out loadtest.json
+"""
+import argparse
+import csv
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import numpy as np
+
+DATA_PATH = os.getenv("DATA_CSV", "data/names_dataset.csv")
+FALLBACK_NAMES = ["Alice", "Jonathan", "Olivia", "Liam", "Emma", "Noah", "Sophia", "Lucas", "Mia", "Ethan"]
+KOREAN_NAMES = ["하린", "서연", "지우", "민준", "도윤", "서준"]
+
+ROUTES = {
+    "convert": ("POST", "/api/convert"),
+    "save": ("POST", "/api/history/save"),
+    "history": ("GET", "/api/history"),
+}
+
+
+# ---------------- 이름 분포 ----------------
+def load_names(path=DATA_PATH):
+    """(이름, 등장 횟수) 를 많이 나온 순서로. CSV 가 비어 있으면 DB 어휘, 그것도 없으면 기본 목록."""
+    counts = Counter()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("english_name") or "").strip()
+                if name:
+                    counts[name] += 1
+    if counts:
+        print(f"[INFO] {len(counts):,} names from {path}")
+        return counts.most_common()
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from suggest import load_vocabulary
+    try:
+        names, popularity = load_vocabulary()
+    except SQLAlchemyError as e:  # DB 가 없거나 name_trends 가 없는 환경
+        print(f"[WARN] name vocabulary unavailable ({e})")
+        names = []
+    if names:
+        print(f"[INFO] {len(names):,} names from name_trends")
+        return sorted(zip(names, popularity), key=lambda x: -x[1])
+    print("[WARN] no name data, using built-in list")
+    return [(n, 1) for n in FALLBACK_NAMES]
+
+
+class ZipfNames:
+    """순위 r 의 이름을 r^-s 에 비례하는 확률로 뽑는다."""
+
+    def __init__(self, ranked, s=1.1, seed=0):
+        self.names = [n for n, _ in ranked]
+        weights = np.arange(1, len(self.names) + 1, dtype=np.float64) ** -s
+        self.cdf = np.cumsum(weights / weights.sum())
+        self.rnd = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def sample(self):
+        with self._lock:
+            u = self.rnd.random()
+        return self.names[min(int(np.searchsorted(self.cdf, u)), len(self.names) - 1)]
+
+
+def parse_mix(spec):
+    mix = {}
+    for item in spec.split(","):
+        key, _, weight = item.partition("=")
+        if key.strip() not in ROUTES:
+            raise SystemExit(f"unknown route in --mix: {key} (choose from {', '.join(ROUTES)})")
+        mix[key.strip()] = float(weight or 1)
+    return mix
+
+
+# ---------------- 대상 ----------------
+class InProcessTarget:
+    """Flask test client (스레드마다 하나). DATABASE_URL 은 app/db import 전에 정해져 있어야 한다."""
+
+    def __init__(self):
+        from app import app, init_db
+        init_db()  # 임시 DB 에는 테이블이 없다
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method, path, body, headers):
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        return client.open(path, method=method, data=body, headers=headers).status_code
+
+
+class HttpTarget:
+    """keep-alive 연결 (스레드마다 하나)"""
+
+    def __init__(self, url):
+        u = urlparse(url)
+        self.host, self.port = u.hostname, u.port or 80
+        self.local = threading.local()
+
+    def request(self, method, path, body, headers):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            return resp.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self.local.conn = None
+            return 0
+
+
+class Workload:
+    def __init__(self, target, names, mix, seed=0):
+        self.target = target
+        self.names = names
+        self.kinds = list(mix)
+        self.weights = [mix[k] for k in self.kinds]
+        self.rnd = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def one(self):
+        """요청 하나를 보내고 (종류, 상태 코드) 를 돌려준다."""
+        with self._lock:
+            kind = self.rnd.choices(self.kinds, self.weights)[0]
+            user = f"load-{self.rnd.randrange(1000)}"
+        method, path = ROUTES[kind]
+        name = self.names.sample()
+        body = None
+        if kind == "convert":
+            body = json.dumps({"englishName": name})
+        elif kind == "save":
+            body = json.dumps({"englishName": name, "koreanName": KOREAN_NAMES[hash(name) % len(KOREAN_NAMES)]})
+        headers = {"Content-Type": "application/json", "X-User-Id": user}
+        return kind, self.target.request(method, path, body, headers)
+
+
+# ---------------- 부하 모델 ----------------
+def closed_loop(workload, concurrency, duration):
+    stop = threading.Event()
+
+    def user():
+        samples = []
+        while not stop.is_set():
+            start = time.perf_counter()
+            kind, status = workload.one()
+            samples.append((kind, status, time.perf_counter() - start))
+        return samples
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(user) for _ in range(concurrency)]
+        time.sleep(duration)
+        stop.set()
+        return [s for f in futures for s in f.result()]
+
+
+def open_loop(workload, rate, duration, max_workers=256, seed=0):
+    rnd = random.Random(seed)
+    samples, lock = [], threading.Lock()
+
+    def fire(scheduled):
+        kind, status = workload.one()
+        with lock:
+            samples.append((kind, status, time.perf_counter() - scheduled))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        start = time.perf_counter()
+        t = start
+        while t - start < duration:
+            t += rnd.expovariate(rate)
+            delay = t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(fire, t)
+    return samples
+
+
+def summarize(samples, elapsed):
+    lat = np.array([s[2] for s in samples]) * 1000
+    errors = sum(1 for s in samples if s[1] == 0 or s[1] >= 500)
+    by_kind = Counter(s[0] for s in samples)
+
+    def pct(q):
+        return round(float(np.percentile(lat, q)), 2) if len(lat) else None
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 1),
+        "error_rate": round(errors / len(samples), 4) if samples else None,
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p99_ms": pct(99),
+        "mix": dict(by_kind),
+    }
+
+
+def run(args, target):
+    workload = Workload(target, ZipfNames(load_names(args.data), args.zipf_s), parse_mix(args.mix))
+    workload.one()  # 워밍업 (인덱스/모델 로드)
+
+    mode, levels = ("open", args.rate) if args.rate else ("closed", args.concurrency)
+    rows = []
+    print(f"{mode:>8} {'rps':>9} {'err%':>6} {'p50':>8} {'p90':>8} {'p99':>8}")
+    for level in levels:
+        start = time.perf_counter()
+        if mode == "open":
+            samples = open_loop(workload, level, args.duration)
+        else:
+            samples = closed_loop(workload, level, args.duration)
+        row = {mode: level, **summarize(samples, time.perf_counter() - start)}
+        rows.append(row)
+        print(f"{level:>8} {row['throughput_rps']:>9} {(row['error_rate'] or 0) * 100:>6.2f} "
+              f"{row['p50_ms']:>8} {row['p90_ms']:>8} {row['p99_ms']:>8}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"target": args.url or "in-process", "mix": parse_mix(args.mix), "mode": mode, "results": rows},
+                      f, ensure_ascii=False, indent=2)
+        print(f"[DONE] saved {args.out}")
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="대상 서버 (없으면 프로세스 안에서 Flask 앱 직접 호출)")
+    parser.add_argument("--mix", default="convert=0.7,save=0.2,history=0.1")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="closed loop 사용자 수")
+    parser.add_argument("--rate", type=float, nargs="+", help="open loop 초당 도착률 (지정하면 closed loop 대신 사용)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--zipf-s", type=float, default=1.1)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--database-url", help="프로세스 안 대상이 쓸 DB (없으면 임시 SQLite, 저장소의 DB 는 건드리지 않는다)")
+    parser.add_argument("--out", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    if args.url:
+        run(args, HttpTarget(args.url))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        # db 모듈 import 전에 지정 (load_names 의 어휘 조회도 같은 DB 를 쓴다)
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tmp, 'loadtest.db')}"
+        run(args, InProcessTarget())
+        from db import engine
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,56 @@
 """
 Korea/UK boys·girls 연도별 Excel → 통합 CSV 생성
 output : data/names_dataset.csv (english_name,korean_name,gender,region,year)
+
+ingest 매니페스트에 기록된 파일은 캐시된 파티션을 재사용하고,
+새로 추가되거나 내용이 바뀐 파일만 다시 읽는다.
 """
 import os, glob, re, pandas as pd
+from ingest import IngestManifest
 OUT = "data/names_dataset.csv"
 # 데이터가 위치한 디렉터리 (backend/data/...)
 BASES = ["data/KoreaData", "data/UKData"]
+COLUMNS = ["english_name", "korean_name", "gender", "region", "year"]
 pattern = re.compile(r"(Korea|UK).*?/(boys|girls)/.*?(\\d{4})")
 
-rows = []
-for base in BASES:
-    for path in glob.glob(os.path.join(base, "**/*.xls*"), recursive=True):
-        m = pattern.search(path.replace("\\", "/"))
-        if not m:
-            continue
-        region, gender, year = m.groups()
-        df = pd.read_excel(path, engine="openpyxl" if path.endswith("x") else None)
-        if df.shape[1] < 2:       # 최소 두 컬럼
+
+def parse_file(path):
+    m = pattern.search(path.replace("\\", "/"))
+    if not m:
+        return None
+    region, gender, year = m.groups()
+    df = pd.read_excel(path, engine="openpyxl" if path.endswith("x") else None)
+    if df.shape[1] < 2:       # 최소 두 컬럼
+        return None
+    en_col, ko_col = df.columns[:2]
+    rows = []
+    for en, ko in zip(df[en_col], df[ko_col]):
+        if pd.isna(en) or pd.isna(ko):
             continue
-        en_col, ko_col = df.columns[:2]
-        for en, ko in zip(df[en_col], df[ko_col]):
-            if pd.isna(en) or pd.isna(ko):
-                continue
-            rows.append({
-                "english_name": str(en).strip(),
-                "korean_name" : str(ko).strip(),
-                "gender"      : gender,
-                "region"      : region,
-                "year"        : int(year),
-            })
+        rows.append({
+            "english_name": str(en).strip(),
+            "korean_name" : str(ko).strip(),
+            "gender"      : gender,
+            "region"      : region,
+            "year"        : int(year),
+        })
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+paths = sorted(p for base in BASES for p in glob.glob(os.path.join(base, "**/*.xls*"), recursive=True))
+manifest = IngestManifest("merge")
+frames, fresh, stale = manifest.sync(paths, parse_file)
 
-pd.DataFrame(rows).to_csv(OUT, index=False)
-print(f"[DONE] {len(rows):,} rows saved → {OUT}")
\ No newline at end of file
+if fresh and not stale and not manifest.full_rebuild and len(frames) > len(fresh) and os.path.exists(OUT):
+    # 이전에 처리한 파일은 그대로이고 새 파일만 추가된 경우: 기존 CSV 뒤에 이어 붙인다
+    added = pd.concat([frames[k] for k in fresh], ignore_index=True)
+    added.to_csv(OUT, mode="a", header=False, index=False)
+    print(f"[DONE] {len(added):,} new rows appended → {OUT}")
+elif stale or fresh or manifest.full_rebuild or not os.path.exists(OUT):
+    # 변경/삭제된 파일이 있거나 파티션 캐시가 깨졌으면 파티션들로 다시 조립 (Excel 재파싱 없음)
+    merged = pd.concat(frames.values(), ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+    merged.to_csv(OUT, index=False)
+    print(f"[DONE] {len(merged):,} rows saved → {OUT}")
+else:
+    print(f"[SKIP] no new or changed source files, {OUT} is up to date")
+manifest.save()
@@ -0,0 +1,146 @@
+"""프로세스 내 지연시간 히스토그램 (/metrics, Server-Timing)
+
+요청마다 route 별 전체 시간과 단계(stage)별 시간을 고정 버킷 히스토그램에 누적한다.
+  with stage("encode"):
+      ...
+단계 시간은 요청 단위로도 모아 Server-Timing 헤더(`encode;dur=0.42, ...`)로 돌려준다.
+render() 는 Prometheus text format 을 만든다.
+
+Sentry 는 모든 요청을 추적하지 않고 route 별 비율(SENTRY_TRACES_SAMPLE_RATES)로만 추적한다.
+"""
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# 초 단위 버킷 (0.1ms ~ 2.5s)
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+PREFIX = "wmkn"
+
+# 예) "/api/convert=0.01,/api/history=0.05,/metrics=0" — 가장 긴 접두사가 적용된다
+SENTRY_TRACES_SAMPLE_RATE = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.05"))
+SENTRY_TRACES_SAMPLE_RATES = os.getenv("SENTRY_TRACES_SAMPLE_RATES", "/metrics=0")
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._series = {}  # label 값 튜플 → [버킷별 개수..., +Inf 개수, 합계]
+
+    def observe(self, value, *label_values):
+        i = bisect_left(BUCKETS, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(BUCKETS) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for label_values, series in items:
+            labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+            cumulative = 0
+            for le, n in zip(BUCKETS + ("+Inf",), series[:-1]):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+REQUESTS = Histogram(f"{PREFIX}_request_duration_seconds", "HTTP 요청 처리 시간", ("route", "method", "status"))
+STAGES = Histogram(f"{PREFIX}_stage_duration_seconds", "요청 내 단계별 처리 시간", ("route", "stage"))
+
+# 현재 요청의 (route, [(stage, 초), ...]). 스레드/asyncio 태스크마다 따로 보인다.
+_current = contextvars.ContextVar("metrics_request", default=None)
+_collectors = []
+
+
+def begin(route):
+    """요청 시작: 이후 stage() 기록을 이 요청에 모은다."""
+    _current.set((route, []))
+
+
+def set_route(route):
+    current = _current.get()
+    if current is not None:
+        _current.set((route, current[1]))
+
+
+@contextmanager
+def stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        current = _current.get()
+        if current is not None:
+            current[1].append((name, elapsed))
+            STAGES.observe(elapsed, current[0], name)
+
+
+def finish(method, status, elapsed):
+    """요청 종료: 전체 시간을 기록하고 Server-Timing 헤더 값을 돌려준다."""
+    current = _current.get()
+    if current is None:
+        return None
+    route, stages = current
+    REQUESTS.observe(elapsed, route, method, str(status))
+    _current.set(None)
+    parts = [f"{name};dur={sec * 1000:.3f}" for name, sec in stages]
+    parts.append(f"total;dur={elapsed * 1000:.3f}")
+    return ", ".join(parts)
+
+
+def register_collector(fn):
+    """render() 때 추가 줄(list[str])을 돌려주는 함수 등록 (admission 카운터 등)."""
+    _collectors.append(fn)
+
+
+def render():
+    lines = REQUESTS.render() + STAGES.render()
+    for fn in _collectors:
+        lines.extend(fn())
+    return "\n".join(lines) + "\n"
+
+
+def counter_lines(name, help_text, values, label):
+    """{label 값: 숫자} → Prometheus counter 줄"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    lines += [f'{name}{{{label}="{k}"}} {v}' for k, v in values.items()]
+    return lines
+
+
+# ---------------- Sentry route 별 샘플링 ----------------
+def _parse_rates(spec):
+    rates = []
+    for item in spec.split(","):
+        prefix, sep, rate = item.strip().partition("=")
+        if sep:
+            rates.append((prefix.strip(), float(rate)))
+    return sorted(rates, key=lambda r: len(r[0]), reverse=True)
+
+
+ROUTE_SAMPLE_RATES = _parse_rates(SENTRY_TRACES_SAMPLE_RATES)
+
+
+def traces_sampler(sampling_context):
+    """sentry_sdk.init(traces_sampler=...) 용. 상위 서비스의 결정이 있으면 따른다."""
+    parent = sampling_context.get("parent_sampled")
+    if parent is not None:
+        return float(parent)
+    path = (sampling_context.get("wsgi_environ") or {}).get("PATH_INFO") \
+        or (sampling_context.get("asgi_scope") or {}).get("path") or ""
+    for prefix, rate in ROUTE_SAMPLE_RATES:
+        if path.startswith(prefix):
+            return rate
+    return SENTRY_TRACES_SAMPLE_RATE
@@ -0,0 +1,259 @@
+"""모델 레지스트리 (버전 교체 + shadow 평가)
+
+버전마다 디렉터리 하나에 모델/토크나이저/인덱스를 함께 둔다.
+  models/registry/<version>/en.npz     영어 타워 가중치 + 문자 사전 (numpy_encoder)
+                            ko.npz     한국어 타워 가중치 + 문자 사전
+                            index.npz  카탈로그(name_trends) + 한국어 임베딩
+  models/registry/ACTIVE               현재 서비스 중인 버전 이름
+
+activate() 는 새 버전을 완전히 로드한 뒤 참조 하나만 바꾸므로 재시작 없이 원자적으로 교체된다.
+다른 워커는 ACTIVE 파일 변경을 주기적으로 확인해 같은 버전으로 따라간다.
+shadow 버전을 지정하면 /api/convert 요청 일부를 응답 경로 밖(백그라운드 스레드)에서
+후보 버전으로도 계산해 지연시간과 결과 겹침(overlap@k)을 기록한다.
+
+사용법:
+  python model_registry.py register <version> models/dual_encoder   # <prefix>_en.npz/_ko.npz 등록
+  python model_registry.py activate <version>
+  python model_registry.py list
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+REGISTRY_DIR = Path(os.getenv("MODEL_REGISTRY_DIR", "models/registry"))
+RELOAD_INTERVAL = float(os.getenv("MODEL_REGISTRY_RELOAD_SEC", "10"))
+SHADOW_MAX_PENDING = int(os.getenv("SHADOW_MAX_PENDING", "32"))
+# 버전 디렉터리를 읽다가 날 수 있는 오류 (파일 없음/권한, 깨진 npz, 빠진 배열)
+LOAD_ERRORS = (OSError, ValueError, KeyError, zipfile.BadZipFile)
+# shadow 추론 실패로 보고 세는 오류 (모양이 맞지 않는 가중치, 수치 오류 등)
+SHADOW_ERRORS = (ValueError, LookupError, ArithmeticError, RuntimeError)
+
+
+def _load_version(path):
+    """버전 디렉터리 → dual_infer.Recommender"""
+    from dual_infer import Catalog, load_numpy
+
+    index_path = path / "index.npz"
+    if index_path.exists():
+        with np.load(index_path, allow_pickle=True) as idx:
+            catalog = Catalog(*(idx[f] for f in Catalog.FIELDS))
+            embeddings_ko = idx["embeddings"]
+        return load_numpy(path / "en.npz", path / "ko.npz", catalog=catalog, embeddings_ko=embeddings_ko)
+
+    # 인덱스가 없으면 DB 카탈로그로 만들고 다음 로드를 위해 저장
+    rec = load_numpy(path / "en.npz", path / "ko.npz")
+    save_index(path, rec)
+    return rec
+
+
+def save_index(path, rec):
+    np.savez(
+        Path(path) / "index.npz",
+        embeddings=rec.embeddings_ko,
+        **{f: getattr(rec.catalog, f) for f in rec.catalog.FIELDS},
+    )
+
+
+class ShadowStats:
+    """shadow 비교 결과 누적 (최근 window 개로 백분위 계산)."""
+
+    def __init__(self, window=1000):
+        self.lock = threading.Lock()
+        self._reset(window)
+
+    def reset(self, window=1000):
+        with self.lock:
+            self._reset(window)
+
+    def _reset(self, window):
+        self.sampled = 0
+        self.dropped = 0
+        self.errors = 0
+        self.overlap_sum = 0.0
+        self.latencies = deque(maxlen=window)
+        self.primary_latencies = deque(maxlen=window)
+
+    def record(self, latency, primary_latency, overlap):
+        with self.lock:
+            self.sampled += 1
+            self.overlap_sum += overlap
+            self.latencies.append(latency)
+            self.primary_latencies.append(primary_latency)
+
+    def drop(self):
+        with self.lock:
+            self.dropped += 1
+
+    def error(self):
+        with self.lock:
+            self.errors += 1
+
+    def snapshot(self):
+        with self.lock:
+            def pct(values, q):
+                return round(float(np.percentile(values, q)) * 1000, 3) if values else None
+            return {
+                "sampled": self.sampled,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "mean_overlap": round(self.overlap_sum / self.sampled, 4) if self.sampled else None,
+                "shadow_p50_ms": pct(self.latencies, 50),
+                "shadow_p99_ms": pct(self.latencies, 99),
+                "primary_p50_ms": pct(self.primary_latencies, 50),
+                "primary_p99_ms": pct(self.primary_latencies, 99),
+            }
+
+
+class ModelRegistry:
+    def __init__(self, root=REGISTRY_DIR, loader=_load_version):
+        self.root = Path(root)
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._active = None          # (version, recommender)
+        self._active_mtime = None
+        self._checked_at = float("-inf")
+        self._shadow = None          # (version, recommender, fraction)
+        self.shadow_stats = ShadowStats()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._pending = threading.BoundedSemaphore(SHADOW_MAX_PENDING)
+
+    # ---------------- 버전 관리 ----------------
+    def versions(self):
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "en.npz").exists())
+
+    @property
+    def active_file(self):
+        return self.root / "ACTIVE"
+
+    def activate(self, version):
+        """version 을 로드해 active 로 교체한다. 로드에 실패하면 기존 버전을 유지한다."""
+        # 등록된 버전 이름만 허용 (None, "../x" 같은 값이 root 밖 경로가 되지 않게)
+        if version not in self.versions():
+            raise KeyError(version)
+        path = self.root / version
+        rec = self.loader(path)
+        with self._lock:
+            self._active = (version, rec)
+        tmp = self.active_file.with_suffix(".tmp")
+        tmp.write_text(version, encoding="utf-8")
+        os.replace(tmp, self.active_file)
+        self._active_mtime = self.active_file.stat().st_mtime
+        return version
+
+    def _maybe_reload(self):
+        """ACTIVE 파일이 바뀌었으면(다른 워커/CLI 가 교체) 같은 버전으로 따라간다."""
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_INTERVAL:
+            return
+        self._checked_at = now
+        try:
+            mtime = self.active_file.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._active_mtime:
+            return
+        version = self.active_file.read_text(encoding="utf-8").strip()
+        if self._active is None or self._active[0] != version:
+            try:
+                rec = self.loader(self.root / version)
+            except LOAD_ERRORS as e:
+                print(f"[WARN] failed to load model version {version}: {e}")
+                return
+            with self._lock:
+                self._active = (version, rec)
+        self._active_mtime = mtime
+
+    @property
+    def active(self):
+        """(version, recommender) 또는 None"""
+        self._maybe_reload()
+        return self._active
+
+    # ---------------- shadow ----------------
+    def set_shadow(self, version, fraction):
+        if version is None:
+            self._shadow = None
+            return
+        fraction = shadow_fraction(fraction)
+        rec = self.loader(self.root / version)
+        self.shadow_stats.reset()
+        self._shadow = (version, rec, fraction)
+
+    def maybe_shadow(self, english_name, k, primary, primary_latency):
+        """fraction 확률로 후보 버전 추론을 백그라운드에 맡긴다. 요청 스레드는 기다리지 않는다."""
+        shadow = self._shadow
+        if shadow is None or random.random() >= shadow[2]:
+            return
+        if not self._pending.acquire(blocking=False):
+            self.shadow_stats.drop()  # 대기열이 차면 버린다 (서비스 지연 방지)
+            return
+        self._executor.submit(self._run_shadow, shadow[1], english_name, k, primary, primary_latency)
+
+    def _run_shadow(self, rec, english_name, k, primary, primary_latency):
+        try:
+            start = time.perf_counter()
+            candidates = rec.recommend(english_name, k)
+            latency = time.perf_counter() - start
+            a = {c["koreanName"] for c in primary}
+            b = {c["koreanName"] for c in candidates}
+            overlap = len(a & b) / max(len(a | b), 1)
+            self.shadow_stats.record(latency, primary_latency, overlap)
+        except SHADOW_ERRORS:
+            self.shadow_stats.error()
+        finally:
+            self._pending.release()
+
+    def status(self):
+        active = self.active
+        shadow = self._shadow
+        return {
+            "versions": self.versions(),
+            "active": active[0] if active else None,
+            "shadow": {"version": shadow[0], "fraction": shadow[2]} if shadow else None,
+            "shadowStats": self.shadow_stats.snapshot(),
+        }
+
+
+def shadow_fraction(value):
+    """shadow 로 보낼 요청 비율. 0~1 사이 숫자가 아니면 ValueError (bool, 문자열, NaN 포함)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0.0 <= value <= 1.0:
+        raise ValueError("fraction must be a number between 0 and 1")
+    return float(value)
+
+
+def register(version, prefix, root=REGISTRY_DIR):
+    """학습 산출물(<prefix>_en.npz, <prefix>_ko.npz)을 새 버전 디렉터리로 복사하고 인덱스를 만든다."""
+    from dual_infer import load_numpy
+
+    path = Path(root) / version
+    if path.exists():
+        raise FileExistsError(path)
+    path.mkdir(parents=True)
+    shutil.copy(f"{prefix}_en.npz", path / "en.npz")
+    shutil.copy(f"{prefix}_ko.npz", path / "ko.npz")
+    save_index(path, load_numpy(path / "en.npz", path / "ko.npz"))
+    (path / "manifest.json").write_text(
+        json.dumps({"version": version, "source": str(prefix), "created_at": time.time()}), encoding="utf-8")
+    return path
+
+
+if __name__ == "__main__":
+    cmd, *rest = sys.argv[1:] or ["list"]
+    if cmd == "register":
+        print("[DONE] registered", register(*rest))
+    elif cmd == "activate":
+        print("[DONE] active →", ModelRegistry().activate(*rest))
+    else:
+        print(json.dumps(ModelRegistry().status(), ensure_ascii=False, indent=2))
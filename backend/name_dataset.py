@@ -0,0 +1,26 @@
+"""학습/평가 공용 (영어 이름, 한국어 이름) 데이터 로드와 학습/검증 분할
+
+dual_encoder.run(학습)과 retrieval_eval.py(오프라인 평가)가 같은 행을 검증 집합으로 쓰도록
+결측 행 제거와 분할 규칙을 한 곳에 둔다. TensorFlow 를 import 하지 않는다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = os.getenv("DATA_CSV", "data/names_dataset.csv")
+VAL_FRACTION = 0.1
+SPLIT_SEED = 42
+
+
+def load_pairs(path=DATA_PATH, columns=None):
+    """english_name, korean_name 이 모두 있는 행만 (행 번호 0..n-1 로 다시 매김)."""
+    df = pd.read_csv(path, usecols=columns)
+    return df.dropna(subset=["english_name", "korean_name"]).reset_index(drop=True)
+
+
+def split_indices(n, test_size=VAL_FRACTION, seed=SPLIT_SEED):
+    """(학습 행 번호, 검증 행 번호). 분할은 행 수와 seed 로만 결정된다."""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(np.arange(n), test_size=test_size, random_state=seed)
@@ -1,8 +1,20 @@
-"""간단한 규칙 기반 한국어 이름 추천 로직 (MVP)"""
-import random
-import hashlib
-from typing import List, Dict
+"""간단한 규칙 기반 한국어 이름 추천 로직 (MVP)
 
+후보 풀과 eraScore 는 name_popularity.py 가 출생신고 랭킹 데이터로 미리 계산한
+data/name_popularity.csv 에서 서버 기동 시 한 번만 읽어 온다.
+요청마다 해시/난수 생성 없이, 영어 이름 전체와 발음이 가까운 후보를 고른다 (첫 글자 초성, eraScore 순으로 동점 처리).
+의미(meaning)는 테이블에 meaning 열이 있을 때만 응답에 넣는다.
+"""
+import csv
+import heapq
+import os
+from pathlib import Path
+
+from phonetic import bigrams, romanize, skeleton
+
+POPULARITY_CSV = Path(os.getenv("NAME_POPULARITY_CSV", Path(__file__).parent / "data" / "name_popularity.csv"))
+
+# 인기도 테이블이 없을 때 사용하는 기본 후보
 CANDIDATE_NAMES = [
     "하린",
     "지훈",
@@ -19,42 +31,113 @@ CANDIDATE_NAMES = [
     "시은",
 ]
 
-CANDIDATE_MEANINGS = [
-    "하늘같이 맑고 밝은",
-    "지혜롭고 빛나는",
-    "백성을 이끄는 지도자",
-    "서로를 연모하는 마음",
-    "현명하고 우아한",
-    "지속되는 아름다움",
-    "수려하고 민첩한",
-    "모든 이에게 은혜로움",
-    "예의 바르고 준수한",
-]
+# 한글 초성 인덱스(ㄱ=0 … ㅎ=18)와 비슷하게 들리는 영어 첫 글자
+CHOSEONG_LATIN = {
+    0: "gk", 1: "k", 2: "n", 3: "dt", 4: "t", 5: "lr", 6: "m", 7: "bpv", 8: "p",
+    9: "sc", 10: "s", 11: "aeiouyw", 12: "jgz", 13: "j", 14: "c", 15: "kcq",
+    16: "t", 17: "pf", 18: "h",
+}
+# 발음 유사도가 같을 때 다음으로 치는 비슷한 소리의 초성 묶음 (ㄱㄲㅋ, ㄷㄸㅌ, ㅂㅃㅍ, ㅅㅆㅈㅉㅊ, ㄴㄹ, ㅇㅎ)
+SIMILAR_CHOSEONG = [(0, 1, 15), (3, 4, 16), (7, 8, 17), (9, 10, 12, 13, 14), (2, 5), (11, 18)]
+GENDERS = ("male", "female")
+LATIN_CHOSEONG = {}
+for _cho, _letters in CHOSEONG_LATIN.items():
+    for _ch in _letters:
+        LATIN_CHOSEONG.setdefault(_ch, []).append(_cho)
+
+
+def choseong(hangul: str) -> int:
+    """한글 음절의 초성 인덱스를 반환한다. 한글이 아니면 -1."""
+    code = ord(hangul) - 0xAC00
+    if 0 <= code < 11172:
+        return code // 588
+    return -1
+
+
+def _score(by_gender: dict[str, float], gender: str | None) -> float | None:
+    """성별을 지정하면 그 성별(또는 성별 구분 없는 행)의 점수, 없으면 성별 중 높은 점수. 해당 없으면 None."""
+    if gender is None:
+        return max(by_gender.values())
+    values = [score for g, score in by_gender.items() if g in (gender, "")]
+    return max(values) if values else None
+
+
+def _load_table():
+    """eraScore(성별 중 높은 값) 내림차순으로 정렬된 이름 테이블을 만든다.
+
+    이름마다 성별별 점수, 의미(데이터에 있을 때만), 첫 음절 초성, 발음 bigram 을 미리 계산해 둔다.
+    """
+    rows = []
+    if POPULARITY_CSV.exists():
+        with open(POPULARITY_CSV, encoding="utf-8") as f:
+            rows = [(r["korean_name"], r.get("gender") or "", float(r["era_score"]), r.get("meaning") or "")
+                    for r in csv.DictReader(f)]
+    if not rows:
+        rows = [(name, "", 0.5, "") for name in CANDIDATE_NAMES]
+
+    # 남/여 테이블에 같은 이름이 있으면 성별별 점수를 모두 유지 (성별이 없는 행은 모든 성별에 해당)
+    scores, meanings = {}, {}
+    for name, gender, score, meaning in rows:
+        by_gender = scores.setdefault(name, {})
+        by_gender[gender] = max(score, by_gender.get(gender, -1.0))
+        if meaning:
+            meanings.setdefault(name, meaning)
+    names = tuple(sorted(scores, key=lambda name: -max(scores[name].values())))
+    # 성별 조건별 점수 (None: 성별 중 높은 값, 해당 성별 이름이 아니면 None)
+    by_gender = {
+        gender: tuple(_score(scores[name], gender) for name in names) for gender in (None, *GENDERS)
+    }
+    return (
+        names,
+        by_gender,
+        tuple(meanings.get(name) for name in names),
+        tuple(choseong(name[0]) for name in names),
+        tuple(frozenset(bigrams(skeleton(romanize(name)))) for name in names),
+    )
+
+
+_NAMES, _SCORES, _MEANINGS, _CHOSEONG, _GRAMS = _load_table()
+
+
+def _initial_match(letter: str):
+    """영어 첫 글자 → (발음이 맞는 초성 집합, 비슷한 소리 초성 집합)"""
+    exact = frozenset(LATIN_CHOSEONG.get(letter, ()))
+    similar = frozenset(c for group in SIMILAR_CHOSEONG if exact & set(group) for c in group) - exact
+    return exact, similar
+
 
+_INITIALS = {letter: _initial_match(letter) for letter in LATIN_CHOSEONG}
+_NO_MATCH = (frozenset(), frozenset())
 
-def _hash_to_float(value: str) -> float:
-    """영어 이름에 기반해 0~1 사이 값을 생성한다."""
-    h = hashlib.sha256(value.encode()).hexdigest()
-    return int(h[:8], 16) / 0xFFFFFFFF
 
+def recommend_korean_names(english_name: str, k: int = 3, gender: str | None = None) -> list[dict]:
+    """영어 이름을 기반으로 k개의 한국어 이름 후보를 반환한다.
 
-def recommend_korean_names(english_name: str, k: int = 3) -> List[Dict]:
-    """영어 이름을 기반으로 k개의 한국어 이름 후보를 반환한다."""
+    전체 이름의 발음 유사도(phonetic.skeleton bigram 의 Dice 계수)가 높은 순으로,
+    같으면 첫 글자와 초성이 맞는 이름 → 비슷한 소리 초성 → eraScore 순으로 고른다 (같은 입력이면 같은 결과).
+    gender("male"/"female")를 주면 그 성별 테이블에 있는 이름만 고른다.
+    """
     if not english_name:
         raise ValueError("english_name is required")
+    if gender is not None and gender not in GENDERS:
+        raise ValueError(f"gender must be one of {', '.join(GENDERS)}")
 
-    # 이름에 따라 결정적인 랜덤 시드 설정 -> 같은 입력이면 같은 결과
-    seed = int(hashlib.sha256(english_name.lower().encode()).hexdigest(), 16)
-    rnd = random.Random(seed)
+    grams = bigrams(skeleton(english_name))
+    exact, similar = _INITIALS.get(english_name[0].lower(), _NO_MATCH)
+    scores = _SCORES[gender]
+    ranked = []
+    for i, name_grams in enumerate(_GRAMS):
+        score = scores[i]
+        if score is None:
+            continue
+        dice = 2.0 * len(grams & name_grams) / (len(grams) + len(name_grams))
+        cho = _CHOSEONG[i]
+        ranked.append((-dice, -2 if cho in exact else -1 if cho in similar else 0, -score, i))
 
-    names = rnd.sample(CANDIDATE_NAMES, k)
     results = []
-    for name in names:
-        meaning = rnd.choice(CANDIDATE_MEANINGS)
-        era_score = round(_hash_to_float(name + english_name), 2)
-        results.append({
-            "koreanName": name,
-            "meaning": meaning,
-            "eraScore": era_score,
-        })
-    return results 
\ No newline at end of file
+    for _, _, neg_score, i in heapq.nsmallest(k, ranked):
+        candidate = {"koreanName": _NAMES[i], "eraScore": round(-neg_score, 2)}
+        if _MEANINGS[i]:
+            candidate["meaning"] = _MEANINGS[i]
+        results.append(candidate)
+    return results
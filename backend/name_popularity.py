@@ -0,0 +1,53 @@
+"""한국 이름 인기도(eraScore) 테이블 생성 스크립트
+
+korean_*_names_ranking_2008_2025.xlsx 의 '원본데이터' 시트(시기별 건수)를 읽어
+이름 × 시기 점유율 행렬을 만들고, 시기 축으로 EWMA 를 한 번에 계산한다.
+출력: data/name_popularity.csv (korean_name,gender,era_score,latest_share)
+name_logic 이 서버 기동 시 한 번 읽어 규칙 기반 추천의 후보 풀/eraScore 로 사용한다.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).parent / "data"
+SOURCES = {
+    "male": DATA_DIR / "KoreaData" / "korean_boy_names_ranking_2008_2025.xlsx",
+    "female": DATA_DIR / "KoreaData" / "korean_girls_names_ranking_2008_2025.xlsx",
+}
+OUT = Path(os.getenv("NAME_POPULARITY_CSV", DATA_DIR / "name_popularity.csv"))
+EWMA_ALPHA = float(os.getenv("EWMA_ALPHA", "0.3"))
+
+
+def ewma_weights(n_periods, alpha=EWMA_ALPHA):
+    """가장 최근 시기에 가장 큰 가중치를 주는 EWMA 가중치 벡터 (합계 1)."""
+    w = alpha * (1 - alpha) ** np.arange(n_periods - 1, -1, -1, dtype=np.float64)
+    return w / w.sum()
+
+
+def build_popularity_table(sources=SOURCES, alpha=EWMA_ALPHA):
+    frames = []
+    for gender, path in sources.items():
+        raw = pd.read_excel(path, sheet_name="원본데이터")
+        # 이름 × 시기 건수 → 시기별 점유율 (시기마다 전체 규모가 달라 비율로 정규화)
+        counts = raw.pivot_table(index="이름", columns="연도범위", values="건수", aggfunc="sum", fill_value=0)
+        counts = counts.reindex(sorted(counts.columns), axis=1)
+        mat = counts.to_numpy(dtype=np.float64)
+        shares = mat / mat.sum(axis=0, keepdims=True)
+
+        ewma = shares @ ewma_weights(shares.shape[1], alpha)
+        frames.append(pd.DataFrame({
+            "korean_name": counts.index,
+            "gender": gender,
+            "era_score": (ewma / ewma.max()).round(4),
+            "latest_share": shares[:, -1].round(4),
+        }))
+    table = pd.concat(frames, ignore_index=True)
+    return table.sort_values("era_score", ascending=False).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    table = build_popularity_table()
+    table.to_csv(OUT, index=False)
+    print(f"[DONE] {len(table):,} names saved → {OUT}")
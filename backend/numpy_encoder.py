@@ -0,0 +1,103 @@
+"""NumPy 전용 Dual-Encoder 타워 추론 엔진
+
+학습된 인코더(Embedding → BiGRU → Dense → L2 정규화)의 가중치와 문자 사전을
+.npz 한 파일로 내보내고, TensorFlow/TFLite 없이 NumPy 만으로 같은 순전파를 배치로 계산한다.
+서버리스 배포에서 TensorFlow import 비용과 패키지 크기를 없애기 위함.
+"""
+import numpy as np
+
+PAD_ID, UNK_ID = 0, 1
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def export_encoder(encoder, charset, max_len, path, lower=False):
+    """keras 인코더 가중치와 charset 을 path(.npz) 로 저장한다. (학습 환경에서만 호출)"""
+    by_type = {type(layer).__name__: layer for layer in encoder.layers}
+    embedding = by_type["Embedding"].get_weights()[0]
+    bi = by_type["Bidirectional"]
+    if not getattr(bi.forward_layer, "reset_after", True):
+        raise ValueError("only GRU(reset_after=True) is supported")
+    f_kernel, f_rec, f_bias, b_kernel, b_rec, b_bias = bi.get_weights()
+    dense_w, dense_b = by_type["Dense"].get_weights()
+
+    chars = sorted(charset, key=charset.get)
+    np.savez_compressed(
+        path,
+        embedding=embedding.astype(np.float32),
+        f_kernel=f_kernel, f_recurrent=f_rec, f_bias=f_bias,
+        b_kernel=b_kernel, b_recurrent=b_rec, b_bias=b_bias,
+        dense_w=dense_w, dense_b=dense_b,
+        chars=np.array(chars, dtype=str),
+        char_ids=np.array([charset[c] for c in chars], dtype=np.int32),
+        max_len=np.int32(max_len),
+        lower=np.bool_(lower),
+    )
+
+
+class NumpyEncoder:
+    """export_encoder 로 저장한 한 쪽 타워의 NumPy 순전파."""
+
+    def __init__(self, weights):
+        self.w = {k: weights[k] for k in weights.files if k not in ("chars", "char_ids", "max_len", "lower")}
+        self.charset = dict(zip(weights["chars"].tolist(), weights["char_ids"].tolist()))
+        self.max_len = int(weights["max_len"])
+        self.lower = bool(weights["lower"])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as weights:
+            return cls(weights)
+
+    def tokenize(self, texts):
+        ids = np.full((len(texts), self.max_len), PAD_ID, dtype=np.int32)
+        for i, text in enumerate(texts):
+            text = str(text).lower() if self.lower else str(text)
+            seq = [self.charset.get(ch, UNK_ID) for ch in text[:self.max_len]]
+            ids[i, :len(seq)] = seq
+        return ids
+
+    @staticmethod
+    def _gru(xw, mask, recurrent, recurrent_bias, reverse):
+        """keras GRU(reset_after=True) 를 마스크를 반영해 배치로 실행한다.
+
+        xw: 모든 timestep 의 입력 투영(x @ W + b_in)을 미리 계산한 (n, T, 3u)
+        마스크된(패딩) timestep 에서는 상태를 그대로 유지한다.
+        """
+        n, steps, three_u = xw.shape
+        u = three_u // 3
+        h = np.zeros((n, u), dtype=np.float32)
+        order = range(steps - 1, -1, -1) if reverse else range(steps)
+        for t in order:
+            x_z, x_r, x_h = np.split(xw[:, t], 3, axis=1)
+            h_z, h_r, h_h = np.split(h @ recurrent + recurrent_bias, 3, axis=1)
+            z = _sigmoid(x_z + h_z)
+            r = _sigmoid(x_r + h_r)
+            h_new = z * h + (1.0 - z) * np.tanh(x_h + r * h_h)
+            h = np.where(mask[:, t, None], h_new, h)
+        return h
+
+    def __call__(self, ids):
+        """(n, max_len) int 배열 → (n, EMB_DIM) L2 정규화 임베딩."""
+        w = self.w
+        mask = ids != PAD_ID
+        x = w["embedding"][ids]
+        fwd = self._gru(x @ w["f_kernel"] + w["f_bias"][0], mask, w["f_recurrent"], w["f_bias"][1], reverse=False)
+        bwd = self._gru(x @ w["b_kernel"] + w["b_bias"][0], mask, w["b_recurrent"], w["b_bias"][1], reverse=True)
+        out = np.concatenate([fwd, bwd], axis=1) @ w["dense_w"] + w["dense_b"]
+        norm = np.sqrt(np.maximum((out * out).sum(axis=1, keepdims=True), 1e-12))
+        return (out / norm).astype(np.float32)
+
+    def embed(self, texts, batch_size=4096):
+        ids = self.tokenize(texts)
+        if len(ids) == 0:
+            return np.zeros((0, self.w["dense_b"].shape[0]), dtype=np.float32)
+        return np.vstack([self(ids[i:i + batch_size]) for i in range(0, len(ids), batch_size)])
+
+
+def max_abs_diff(encoder, np_encoder, ids):
+    """keras 인코더와 NumPy 인코더 출력의 최대 절대 오차."""
+    expected = np.asarray(encoder.predict(ids, batch_size=4096, verbose=0))
+    return float(np.abs(expected - np_encoder(ids)).max())
@@ -0,0 +1,137 @@
+"""발음 기반 후보 생성 (2단계 검색의 1단계)
+
+한글 카탈로그 이름을 로마자(국어의 로마자 표기법, 음운 변동 제외)로 바꾸고
+영어 이름과 같은 규칙으로 거친 발음 문자열(skeleton)을 만든 뒤 문자 bigram 역색인을 만든다.
+영어 입력은 bigram 겹침(Dice)으로 수백 개 후보만 골라 dual encoder 점수 계산(2단계)에 넘긴다.
+
+사용법:
+  python phonetic.py          # DB 의 영어 이름으로 전체 스캔 대비 지연시간/recall 비교
+"""
+import copy
+import os
+import re
+import time
+
+# numpy 는 PhoneticIndex 를 만들 때 import 한다 (name_logic 이 romanize/skeleton 만 쓰므로 cold start 유지)
+
+PREFILTER_CANDIDATES = int(os.getenv("PREFILTER_CANDIDATES", "300"))
+
+CHOSEONG = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+JUNGSEONG = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we", "wi",
+             "yu", "eu", "ui", "i"]
+JONGSEONG = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l", "p", "l", "m", "p", "p", "t", "t",
+             "ng", "t", "t", "k", "t", "p", "t"]
+
+# 비슷하게 들리는 자음을 한 부류로, 모음은 모두 'a' 로 묶는다
+_CLASSES = {
+    **dict.fromkeys("bpfv", "p"), **dict.fromkeys("dt", "t"), **dict.fromkeys("gkcqx", "k"),
+    **dict.fromkeys("jz", "j"), "s": "s", **dict.fromkeys("lr", "l"), "m": "m", "n": "n", "h": "h",
+    **dict.fromkeys("aeiouyw", "a"),
+}
+_SOFT_C = re.compile(r"c(?=[eiy])")
+
+
+def romanize(text: str) -> str:
+    """한글 음절을 로마자로 바꾼다. 한글이 아닌 글자는 그대로 둔다."""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(CHOSEONG[code // 588] + JUNGSEONG[(code % 588) // 28] + JONGSEONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def skeleton(latin: str) -> str:
+    """로마자 문자열 → 발음 부류 문자열 (연속된 같은 부류는 하나로)."""
+    latin = latin.lower().replace("ch", "j").replace("sh", "s").replace("ph", "p").replace("ng", "n")
+    # 영어의 e/i/y 앞 c 는 s 소리 (Alice, Grace, Lucy)
+    latin = _SOFT_C.sub("s", latin)
+    out = []
+    for ch in latin:
+        c = _CLASSES.get(ch)
+        if c and (not out or out[-1] != c):
+            out.append(c)
+    return "".join(out)
+
+
+def bigrams(key: str):
+    padded = f"^{key}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class PhoneticIndex:
+    """한국어 이름 목록(Catalog.by_name 으로 합친 고유 이름)의 bigram 역색인."""
+
+    def __init__(self, korean_names):
+        import numpy as np
+
+        self.n_names = len(korean_names)
+        postings = {}
+        self.sizes = np.zeros(self.n_names, dtype=np.float32)
+        for i, name in enumerate(korean_names):
+            grams = bigrams(skeleton(romanize(str(name))))
+            self.sizes[i] = len(grams)
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+        self.postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    def candidates(self, english_name: str, n: int = PREFILTER_CANDIDATES):
+        """영어 이름과 발음이 가까운 이름 상위 n 개의 카탈로그 번호를 반환한다."""
+        import numpy as np
+
+        grams = bigrams(skeleton(english_name))
+        hit = [self.postings[g] for g in grams if g in self.postings]
+        if not hit:
+            return np.zeros(0, dtype=np.int64)
+        common = np.bincount(np.concatenate(hit), minlength=self.n_names)
+        dice = 2.0 * common / (self.sizes + len(grams))
+        if n < self.n_names:
+            top = np.argpartition(-dice, n - 1)[:n]
+        else:
+            top = np.arange(self.n_names)
+        return top[common[top] > 0]
+
+
+def compare(rec, queries, k=3, n=PREFILTER_CANDIDATES):
+    """전체 스캔 vs 발음 후보 + dense 점수의 지연시간과 recall@k(전체 스캔 top-k 기준).
+
+    rec 는 바꾸지 않는다 (prefilter 만 다른 얕은 복사본 두 개로 비교).
+    """
+    import numpy as np
+
+    full_scan = copy.copy(rec)
+    full_scan.prefilter = None
+    two_stage = copy.copy(rec)
+    two_stage.prefilter = rec.prefilter or PhoneticIndex(rec.catalog.korean_name)
+    full_t, two_t, recall = [], [], []
+    for q in queries:
+        t = time.perf_counter()
+        full = full_scan.recommend(q, k)
+        full_t.append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        two = two_stage.recommend(q, k, n_candidates=n)
+        two_t.append(time.perf_counter() - t)
+
+        a = {c["koreanName"] for c in full}
+        recall.append(len(a & {c["koreanName"] for c in two}) / max(len(a), 1))
+    return {
+        "queries": len(queries),
+        "catalog_names": len(rec.catalog),
+        "candidates": n,
+        "full_scan_p50_ms": round(float(np.median(full_t)) * 1000, 3),
+        "two_stage_p50_ms": round(float(np.median(two_t)) * 1000, 3),
+        f"recall@{k}": round(float(np.mean(recall)), 4) if recall else None,
+    }
+
+
+if __name__ == "__main__":
+    import dual_infer
+    from db import SessionLocal
+    from models import NameTrend
+
+    with SessionLocal() as db:
+        queries = [r[0] for r in db.query(NameTrend.english_name).distinct().limit(1000)]
+    print(compare(dual_infer.get_default(), queries))
@@ -0,0 +1,269 @@
+"""오프라인 검색 품질/속도 평가 + 설정 sweep
+
+학습과 같은 분할(name_dataset.split_indices)의 검증 영어 이름으로
+한국어 이름 카탈로그를 검색해 recall@k 와 MRR 을 계산하고, 검색 방식별로 지연시간을 잰다.
+  - exact       전체 float32 스캔
+  - ivf         k-means 역파일 ANN, nprobe 여러 값
+  - int8        행마다 스케일을 둔 int8 양자화 저장 (메모리 1/4)
+  - phonetic    phonetic.PhoneticIndex 로 후보 n 개만 dense 점수 계산
+같은 영어 이름이 데이터셋에서 여러 한국어 이름과 짝지어져 있으면 그중 하나만 찾아도 정답으로 본다.
+결과는 JSON 으로 저장하고, 지연시간-품질 산점도에 Pareto 최적 설정을 표시한다 (matplotlib 필요).
+
+사용법:
+  python retrieval_eval.py                                   # models/dual_encoder_{en,ko}.npz
+  python retrieval_eval.py --model-prefix models/registry/v3/ --plot sweep.png --out sweep.json
+  python retrieval_eval.py --stand-in --limit 2000            # 무작위 가중치 대역 모델로 도구만 점검
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from dual_infer import MODEL_NUMPY_EN, MODEL_NUMPY_KO
+from name_dataset import DATA_PATH, load_pairs, split_indices
+from numpy_encoder import NumpyEncoder
+from phonetic import PhoneticIndex
+
+EVAL_KS = (1, 5, 10)
+IVF_PROBES = (1, 2, 4, 8, 16, 32)
+PHONETIC_CANDIDATES = (100, 300, 1000)
+
+
+# ---------------- 데이터 ----------------
+def load_split(path=DATA_PATH, limit=None):
+    """(검증 영어 이름, 카탈로그 한국어 이름, 영어 이름별 정답 카탈로그 번호 집합)"""
+    df = load_pairs(path, columns=["english_name", "korean_name"])
+    # 학습(dual_encoder.run)과 같은 행/분할
+    _, val_idx = split_indices(len(df))
+    catalog = np.array(sorted(df["korean_name"].unique()), dtype=object)
+    position = {name: i for i, name in enumerate(catalog)}
+    relevant = {}
+    for en, ko in zip(df["english_name"].str.lower(), df["korean_name"]):
+        relevant.setdefault(en, set()).add(position[ko])
+    queries = df["english_name"].iloc[val_idx].tolist()
+    if limit:
+        queries = queries[:limit]
+    return queries, catalog, relevant
+
+
+# ---------------- 검색 방식 ----------------
+def top_k(scores, k):
+    k = min(k, len(scores))
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part])]
+
+
+class ExactIndex:
+    def __init__(self, emb):
+        self.emb = emb
+
+    def search(self, q, k, english_name=None):
+        return top_k(self.emb @ q, k)
+
+    @property
+    def nbytes(self):
+        return self.emb.nbytes
+
+
+class Int8Index:
+    """행마다 max-abs 스케일로 int8 양자화해 저장한다."""
+
+    def __init__(self, emb):
+        self.scale = (np.abs(emb).max(axis=1) / 127.0).astype(np.float32) + 1e-12
+        self.codes = np.round(emb / self.scale[:, None]).astype(np.int8)
+
+    def search(self, q, k, english_name=None):
+        return top_k((self.codes @ q) * self.scale, k)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.scale.nbytes
+
+
+class IVFIndex:
+    """구면 k-means 로 카탈로그를 nlist 개 목록으로 나누고 q 와 가까운 nprobe 개 목록만 스캔한다."""
+
+    def __init__(self, emb, nlist=None, iters=10, seed=0):
+        n = len(emb)
+        nlist = nlist or max(1, int(np.sqrt(n)))
+        rnd = np.random.default_rng(seed)
+        centroids = emb[rnd.choice(n, nlist, replace=False)].copy()
+        for _ in range(iters):
+            assign = np.argmax(emb @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, emb)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        assign = np.argmax(emb @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        self.ids = order
+        self.emb = emb[order]
+        self.sizes = np.bincount(assign, minlength=nlist)
+        self.offsets = np.concatenate([[0], np.cumsum(self.sizes)])
+        self.centroids = centroids
+        self.nprobe = 1
+
+    def search(self, q, k, english_name=None):
+        # 빈 목록은 건너뛰고, nprobe 개 목록의 행이 k 개보다 적으면 다음으로 가까운 목록까지 넓힌다
+        order = np.argsort(-(self.centroids @ q))
+        order = order[self.sizes[order] > 0]
+        covered = np.cumsum(self.sizes[order])
+        n = max(self.nprobe, int(np.searchsorted(covered, min(k, covered[-1]))) + 1)
+        rows = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in order[:n]])
+        return self.ids[rows[top_k(self.emb[rows] @ q, k)]]
+
+    @property
+    def nbytes(self):
+        return self.emb.nbytes + self.centroids.nbytes + self.ids.nbytes
+
+
+class PhoneticPrefilter:
+    def __init__(self, emb, catalog):
+        self.emb = emb
+        self.index = PhoneticIndex(catalog)
+        self.n = 300
+
+    def search(self, q, k, english_name=None):
+        rows = self.index.candidates(english_name, self.n)
+        if len(rows) < k:
+            return top_k(self.emb @ q, k)
+        return rows[top_k(self.emb[rows] @ q, k)]
+
+    @property
+    def nbytes(self):
+        return self.emb.nbytes + sum(p.nbytes for p in self.index.postings.values())
+
+
+def sweep_configs(emb, catalog):
+    """(모드, 설정, 인덱스) — 같은 인덱스 객체를 설정만 바꿔 재사용한다."""
+    yield "exact", {}, ExactIndex(emb)
+    yield "int8", {}, Int8Index(emb)
+    ivf = IVFIndex(emb)
+    for nprobe in IVF_PROBES:
+        if nprobe <= len(ivf.centroids):
+            ivf.nprobe = nprobe
+            yield "ivf", {"nlist": len(ivf.centroids), "nprobe": nprobe}, ivf
+    phon = PhoneticPrefilter(emb, catalog)
+    for n in PHONETIC_CANDIDATES:
+        phon.n = n
+        yield "phonetic", {"candidates": n}, phon
+
+
+# ---------------- 평가 ----------------
+def evaluate(index, queries, q_emb, relevant, ks=EVAL_KS):
+    max_k = max(ks)
+    hits = np.zeros(len(ks))
+    rr = 0.0
+    lat = np.empty(len(queries))
+    for i, (name, q) in enumerate(zip(queries, q_emb)):
+        start = time.perf_counter()
+        result = index.search(q, max_k, name)
+        lat[i] = time.perf_counter() - start
+        truth = relevant.get(name.lower(), ())
+        rank = next((r for r, idx in enumerate(result) if idx in truth), None)
+        if rank is not None:
+            hits += [rank < k for k in ks]
+            rr += 1.0 / (rank + 1)
+    n = max(len(queries), 1)
+    return {
+        **{f"recall@{k}": round(float(h / n), 4) for k, h in zip(ks, hits)},
+        f"mrr@{max_k}": round(rr / n, 4),
+        "p50_ms": round(float(np.percentile(lat, 50)) * 1000, 4),
+        "p99_ms": round(float(np.percentile(lat, 99)) * 1000, 4),
+        "index_mb": round(index.nbytes / 2**20, 2),
+    }
+
+
+def pareto(rows, quality, latency="p50_ms"):
+    """지연시간이 더 짧으면서 품질도 같거나 높은 설정이 없는 행만 True."""
+    flags = []
+    for r in rows:
+        dominated = any(o is not r and o[latency] <= r[latency] and o[quality] >= r[quality]
+                        and (o[latency] < r[latency] or o[quality] > r[quality]) for o in rows)
+        flags.append(not dominated)
+    return flags
+
+
+def plot(rows, quality, path):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("[WARN] matplotlib not installed, skipping plot")
+        return
+    fig, ax = plt.subplots(figsize=(8, 5))
+    for mode in dict.fromkeys(r["mode"] for r in rows):
+        pts = [r for r in rows if r["mode"] == mode]
+        ax.scatter([r["p50_ms"] for r in pts], [r[quality] for r in pts], label=mode)
+    front = sorted((r for r in rows if r["pareto"]), key=lambda r: r["p50_ms"])
+    ax.plot([r["p50_ms"] for r in front], [r[quality] for r in front], "k--", lw=1, label="pareto")
+    for r in rows:
+        ax.annotate(r["label"], (r["p50_ms"], r[quality]), fontsize=7, xytext=(3, 3), textcoords="offset points")
+    ax.set_xscale("log")
+    ax.set_xlabel("p50 latency per query (ms)")
+    ax.set_ylabel(quality)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    print(f"[DONE] saved {path}")
+
+
+def load_encoders(args):
+    if args.stand_in:
+        import string
+
+        from benchmark_suite import STAND_IN_MAX_LEN, stand_in_encoder
+        en = stand_in_encoder({c: i + 2 for i, c in enumerate(string.ascii_lowercase)}, STAND_IN_MAX_LEN, True)
+        return en, None
+    if args.model_prefix:
+        prefix = args.model_prefix
+        en_path, ko_path = (prefix + "en.npz", prefix + "ko.npz") if prefix.endswith("/") \
+            else (prefix + "_en.npz", prefix + "_ko.npz")
+    else:
+        en_path, ko_path = MODEL_NUMPY_EN, MODEL_NUMPY_KO
+    return NumpyEncoder.load(en_path), NumpyEncoder.load(ko_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--model-prefix", help="<prefix>_en.npz/_ko.npz 또는 레지스트리 버전 디렉터리(끝에 /)")
+    parser.add_argument("--stand-in", action="store_true", help="무작위 가중치 영어 인코더 + 무작위 카탈로그 임베딩")
+    parser.add_argument("--limit", type=int, help="검증 질의 수 제한")
+    parser.add_argument("--quality", default="recall@10", help="Pareto/그래프 기준 품질 지표")
+    parser.add_argument("--out", default="retrieval_sweep.json")
+    parser.add_argument("--plot", default="retrieval_sweep.png")
+    args = parser.parse_args()
+
+    queries, catalog, relevant = load_split(args.data, args.limit)
+    print(f"[INFO] {len(queries):,} held-out queries, catalog {len(catalog):,} korean names")
+    enc_en, enc_ko = load_encoders(args)
+    q_emb = enc_en.embed(queries)
+    if enc_ko is None:
+        emb = np.random.default_rng(0).standard_normal((len(catalog), q_emb.shape[1])).astype(np.float32)
+        emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    else:
+        emb = enc_ko.embed(list(catalog))
+
+    rows = []
+    for mode, params, index in sweep_configs(emb, catalog):
+        result = evaluate(index, queries, q_emb, relevant)
+        label = mode + "".join(f" {k}={v}" for k, v in params.items() if k != "nlist")
+        rows.append({"mode": mode, "label": label, **params, **result})
+        print(f"[INFO] {label:<24} " + " ".join(f"{k}={v}" for k, v in result.items()))
+    for row, flag in zip(rows, pareto(rows, args.quality)):
+        row["pareto"] = flag
+    print("[DONE] pareto-optimal: " + ", ".join(r["label"] for r in rows if r["pareto"]))
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"queries": len(queries), "catalog": len(catalog), "quality": args.quality, "results": rows},
+                  f, ensure_ascii=False, indent=2)
+    print(f"[DONE] saved {args.out}")
+    if args.plot:
+        plot(rows, args.quality, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""WSGI(app.py) vs ASGI(asgi.py) 처리량 비교
+
+두 서버를 각각 단일 프로세스로 띄우고 같은 동시 클라이언트 수로
+/api/convert, /api/history, /api/history/save 를 섞어(--workload) 보낸 뒤 req/s 와 p50/p99 를 출력한다.
+  - wsgi: werkzeug 단일 스레드 서버 (sync 워커 1개와 같은 조건)
+  - asgi: uvicorn 워커 1개 + 추론 스레드 풀(INFERENCE_WORKERS)
+저장 요청이 쌓이므로 서버마다 새 임시 SQLite 를 쓴다 (저장소의 korean_name.db 는 건드리지 않는다).
+
+사용법:
+  python serving_bench.py                       # 동시성 1, 8, 32 로 각 10초
+  python serving_bench.py --concurrency 16 --duration 20 --workload history
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+NAMES = ["Alice", "Jonathan", "Olivia", "Liam", "Emma", "Noah", "Sophia", "Lucas", "Mia", "Ethan"]
+# (비율, 메서드, 경로)
+WORKLOADS = {
+    "mixed": [(0.7, "POST", "/api/convert"), (0.2, "GET", "/api/history"), (0.1, "POST", "/api/history/save")],
+    "convert": [(1.0, "POST", "/api/convert")],
+    "history": [(0.8, "GET", "/api/history"), (0.2, "POST", "/api/history/save")],
+}
+
+
+def serve(kind, port):
+    from app import init_db
+    init_db()  # 임시 DB 에는 테이블이 없다
+    if kind == "wsgi":
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        from app import app
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        make_server("127.0.0.1", port, app, threaded=False, request_handler=QuietHandler).serve_forever()
+    else:
+        import uvicorn
+        uvicorn.run("asgi:app", host="127.0.0.1", port=port, log_level="warning")
+
+
+def wait_ready(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on :{port} did not start")
+
+
+def client(port, stop, seed, workload):
+    rnd = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies, errors = [], 0
+    weights = [w for w, _, _ in workload]
+    while not stop.is_set():
+        _, method, path = rnd.choices(workload, weights)[0]
+        name = rnd.choice(NAMES)
+        body = None
+        if path == "/api/convert":
+            body = json.dumps({"englishName": name})
+        elif path == "/api/history/save":
+            body = json.dumps({"englishName": name, "koreanName": "하린"})
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers={"Content-Type": "application/json", "X-User-Id": "bench"})
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status >= 400:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def measure(port, concurrency, duration, workload=WORKLOADS["mixed"]):
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(client, port, stop, i, workload) for i in range(concurrency)]
+        time.sleep(duration)
+        stop.set()
+        results = [f.result() for f in futures]
+    lat = np.array([x for r in results for x in r[0]]) * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": len(lat),
+        "errors": sum(r[1] for r in results),
+        "req_per_sec": round(len(lat) / duration, 1),
+        "p50_ms": round(float(np.percentile(lat, 50)), 2) if len(lat) else None,
+        "p99_ms": round(float(np.percentile(lat, 99)), 2) if len(lat) else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workload", choices=list(WORKLOADS), default="mixed")
+    parser.add_argument("--port", type=int, default=5101)
+    parser.add_argument("--serve", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, kind in enumerate(["wsgi", "asgi"]):
+            port = args.port + i
+            # 같은 조건으로 비교하도록 서버마다 빈 DB (ASYNC_DATABASE_URL 은 DATABASE_URL 에서 만든다)
+            env = {k: v for k, v in os.environ.items() if k != "ASYNC_DATABASE_URL"}
+            env["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, kind + '.db')}"
+            proc = subprocess.Popen([sys.executable, __file__, "--serve", kind, "--port", str(port)], env=env)
+            try:
+                wait_ready(port)
+                measure(port, 1, 1.0)  # 워밍업 (인덱스/모델 로드)
+                for c in args.concurrency:
+                    result = measure(port, c, args.duration, WORKLOADS[args.workload])
+                    print(json.dumps({"server": kind, "workload": args.workload, **result}))
+            finally:
+                proc.terminate()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    main()
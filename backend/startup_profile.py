@@ -0,0 +1,126 @@
+"""app.py cold start 프로파일러 + 시간 예산 확인
+
+새 파이썬 프로세스에서 `import app` 을 -X importtime 으로 실행해
+app 이 직접 import 하는 모듈별 누적 시간과, 초기화 단계별 시간을 잰다.
+  - import app                 모듈 로드 (cold start 에 포함)
+  - first request (/)          Flask 첫 요청 처리 (cold start 에 포함)
+  - registry                   모델 레지스트리 생성 + ACTIVE 확인 (첫 /api/convert 때)
+  - first /api/convert         오타 인덱스 빌드(DB 읽기) + 추천 — lazy import 로 미룬 비용이 여기에 모인다
+테이블 생성(init_db)은 배포 단계의 일이므로 재지 않는다 (프로파일러는 DB 에 쓰지 않는다).
+중앙값 기준으로 cold start(import + 첫 요청)가 --budget(STARTUP_BUDGET_MS)을,
+첫 실제 API 요청(registry + 첫 /api/convert)이 --convert-budget(FIRST_CONVERT_BUDGET_MS)을 넘으면 종료 코드 1.
+
+사용법:
+  python startup_profile.py                  # 5회 측정, 상위 import 출력
+  python startup_profile.py --budget 250 --convert-budget 400 --runs 10 --out startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "400"))
+FIRST_CONVERT_BUDGET_MS = float(os.getenv("FIRST_CONVERT_BUDGET_MS", "500"))
+COLD_START_STEPS = ("import app", "first request (/)")
+FIRST_CONVERT_STEPS = ("registry", "first /api/convert")
+
+# 자식 프로세스에서 실행: 단계별 시간(ms)을 JSON 한 줄로 stdout 에 출력
+CHILD = r"""
+import json, time
+steps = {}
+def step(name, fn):
+    t = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        steps[name + " [error: " + type(e).__name__ + "]"] = round((time.perf_counter() - t) * 1000, 3)
+        return
+    steps[name] = round((time.perf_counter() - t) * 1000, 3)
+
+mod = {}
+step("import app", lambda: mod.update(app=__import__("app")))
+client = mod["app"].app.test_client()
+step("first request (/)", lambda: client.get("/"))
+step("registry", lambda: mod["app"].get_registry().active)
+step("first /api/convert", lambda: client.post("/api/convert", json={"englishName": "Alice"}))
+print(json.dumps(steps))
+"""
+
+
+def parse_importtime(stderr, root="app"):
+    """-X importtime 출력에서 root 가 직접 import 한 모듈의 누적 시간(ms)."""
+    direct, inside, root_total = {}, False, None
+    lines = [line for line in stderr.splitlines() if line.startswith("import time:") and "|" in line]
+    # importtime 은 자식 모듈이 먼저 출력되므로 거꾸로 읽으며 root 아래 한 단계 들여쓰기만 모은다
+    for line in reversed(lines):
+        _, cumulative, name = line.split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        module = name.strip()
+        if depth == 0:
+            inside = module == root
+            if inside:
+                root_total = int(cumulative) / 1000
+            continue
+        if inside and depth == 1:
+            direct[module] = direct.get(module, 0.0) + int(cumulative) / 1000
+    return root_total, direct
+
+
+def profile_once():
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD],
+                          capture_output=True, text=True, env=os.environ, check=False)
+    if proc.returncode != 0:  # 자식의 traceback(stderr)을 보여 주려고 check=True 대신 직접 확인
+        raise RuntimeError(proc.stderr[-2000:])
+    steps = json.loads(proc.stdout.strip().splitlines()[-1])
+    return steps, parse_importtime(proc.stderr)[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="cold start 예산 (ms)")
+    parser.add_argument("--convert-budget", type=float, default=FIRST_CONVERT_BUDGET_MS,
+                        help="registry + 첫 /api/convert 예산 (ms)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    runs = [profile_once() for _ in range(args.runs)]
+    step_names = list(runs[0][0])
+    steps = {name: round(float(np.median([r[0].get(name, np.nan) for r in runs])), 2) for name in step_names}
+    modules = {}
+    for _, direct in runs:
+        for m, ms in direct.items():
+            modules.setdefault(m, []).append(ms)
+    imports = sorted(((m, round(float(np.median(v)), 2)) for m, v in modules.items()), key=lambda x: -x[1])
+    cold_start = round(sum(steps.get(s, 0.0) for s in COLD_START_STEPS), 2)
+    first_convert = round(sum(steps.get(s, 0.0) for s in FIRST_CONVERT_STEPS), 2)
+
+    print(f"[INFO] median of {args.runs} runs")
+    print("  init step                         ms")
+    for name, ms in steps.items():
+        print(f"  {name:<32} {ms:>8.2f}")
+    print("  top imports under app (cumulative ms)")
+    for m, ms in imports[:args.top]:
+        print(f"  {m:<32} {ms:>8.2f}")
+    cold_over = cold_start > args.budget
+    convert_over = first_convert > args.convert_budget
+    over = cold_over or convert_over
+    print(f"[{'WARN' if cold_over else 'DONE'}] cold start {cold_start:.1f} ms (budget {args.budget:.0f} ms)")
+    print(f"[{'WARN' if convert_over else 'DONE'}] first /api/convert {first_convert:.1f} ms "
+          f"(budget {args.convert_budget:.0f} ms)")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"steps_ms": steps, "imports_ms": dict(imports), "cold_start_ms": cold_start,
+                       "budget_ms": args.budget, "first_convert_ms": first_convert,
+                       "convert_budget_ms": args.convert_budget, "runs": args.runs}, f, ensure_ascii=False, indent=2)
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
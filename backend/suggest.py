@@ -0,0 +1,191 @@
+"""영어 이름 자동완성(typeahead) 인덱스
+
+name_trends 의 고유 english_name 을 소문자 정렬 배열로 메모리에 올려 두고
+접두사 범위를 이진 탐색으로 찾은 뒤 인기도(trend_score 합계) 상위 항목을 돌려준다.
+범위가 큰 짧은 접두사는 빌드 시 상위 목록을 미리 계산해 두어 요청당 DB 조회 없이 1ms 이내로 응답한다.
+인덱스는 SUGGEST_REFRESH_S 마다 백그라운드에서 다시 빌드해 새로 적재된 이름을 반영한다.
+
+사용법:
+  python suggest.py            # 100만 개 합성 어휘로 지연시간(p50/p99) 측정
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from itertools import groupby
+
+import numpy as np
+
+SUGGEST_LIMIT = 10
+PRECOMPUTE_OVER = 2048  # 접두사 범위가 이보다 크면 상위 목록을 미리 계산
+# 빌드한 인덱스를 이 시간(초)이 지나면 백그라운드에서 다시 빌드한다 (0 이면 다시 빌드하지 않음)
+SUGGEST_REFRESH_S = float(os.getenv("SUGGEST_REFRESH_S", "600"))
+# 어휘 로드(DB)에 실패하면 이 시간(초) 동안은 다시 시도하지 않는다
+SUGGEST_RETRY_S = float(os.getenv("SUGGEST_RETRY_S", "60"))
+
+
+class PrefixIndex:
+    def __init__(self, names, popularity, limit=SUGGEST_LIMIT, precompute_over=PRECOMPUTE_OVER):
+        keys = [str(n).lower() for n in names]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self.names = [str(names[i]) for i in order]
+        self.popularity = np.asarray(popularity, dtype=np.float32)[order] if len(order) else np.zeros(0, np.float32)
+        self.limit = limit
+        self._top = {}
+        self._precompute(0, len(self.keys), 1, precompute_over)
+
+    def _top_in_range(self, lo, hi, limit):
+        seg = self.popularity[lo:hi]
+        if len(seg) > limit:
+            part = np.argpartition(-seg, limit - 1)[:limit]
+        else:
+            part = np.arange(len(seg))
+        return tuple((lo + part[np.argsort(-seg[part], kind="stable")]).tolist())
+
+    def _precompute(self, lo, hi, depth, threshold):
+        """범위가 threshold 보다 큰 접두사만 재귀적으로 내려가며 상위 목록을 저장한다."""
+        start = lo
+        for prefix, group in groupby(self.keys[lo:hi], key=lambda k: k[:depth]):
+            end = start + sum(1 for _ in group)
+            # prefix 가 depth 보다 짧으면 그 이름 자체(대소문자만 다른 중복)뿐이라 더 내려갈 필요가 없다
+            if end - start > threshold and len(prefix) == depth:
+                self._top[prefix] = self._top_in_range(start, end, self.limit)
+                self._precompute(start, end, depth + 1, threshold)
+            start = end
+
+    def suggest(self, prefix, limit=SUGGEST_LIMIT):
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        if lo == hi:
+            return []
+        cached = self._top.get(prefix)
+        if cached is not None and limit <= self.limit:
+            idx = cached[:limit]
+        else:
+            idx = self._top_in_range(lo, hi, limit)
+        return [self.names[i] for i in idx]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def load_vocabulary():
+    """name_trends 에서 영어 이름별 인기도(trend_score 합계)를 한 번에 읽는다."""
+    from sqlalchemy import func
+
+    from db import SessionLocal
+    from models import NameTrend
+
+    with SessionLocal() as db:
+        rows = (db.query(NameTrend.english_name, func.sum(NameTrend.trend_score))
+                .group_by(NameTrend.english_name).all())
+    return [r[0] for r in rows], [float(r[1] or 0.0) for r in rows]
+
+
+def load_from_db():
+    return PrefixIndex(*load_vocabulary())
+
+
+class IndexCache:
+    """DB 어휘로 빌드한 인덱스를 메모리에 두고, 실패/만료를 처리한다 (fuzzy 도 같은 방식으로 쓴다).
+
+    - 첫 호출은 빌드를 기다린다. DB 에 연결할 수 없거나 name_trends 가 없으면 None 을 돌려주고
+      retry_s 동안은 다시 시도하지 않는다 (요청마다 실패한 쿼리를 반복하지 않게).
+    - 빌드한 지 refresh_s 가 지나면 요청은 기존 인덱스로 바로 응답하고 새 인덱스는 백그라운드 스레드가 빌드해 교체한다.
+    - refresh() 는 (예: load_trends 적재 직후) 다음 호출에서 바로 다시 빌드하게 한다.
+    """
+
+    def __init__(self, build, name, refresh_s=SUGGEST_REFRESH_S, retry_s=SUGGEST_RETRY_S):
+        self.build = build
+        self.name = name
+        self.refresh_s = refresh_s
+        self.retry_s = retry_s
+        self._index = None
+        self._built_at = 0.0
+        self._failed_at = None
+        self._rebuilding = False
+        self._lock = threading.Lock()
+
+    def _backing_off(self):
+        return self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_s
+
+    def _load(self):
+        from sqlalchemy.exc import SQLAlchemyError
+
+        try:
+            index = self.build()
+        except SQLAlchemyError as e:
+            self._failed_at = time.monotonic()
+            print(f"[WARN] {self.name} vocabulary unavailable, retry in {self.retry_s:.0f}s ({e})")
+            return False
+        self._index, self._built_at, self._failed_at = index, time.monotonic(), None
+        return True
+
+    def _rebuild(self):
+        try:
+            if not self._load():
+                # 기존 인덱스는 유지하고 retry_s 뒤에 다시 시도
+                self._built_at = time.monotonic() - self.refresh_s + self.retry_s
+        finally:
+            self._rebuilding = False
+
+    def get(self):
+        """현재 인덱스 (아직 한 번도 빌드하지 못했으면 None)"""
+        index = self._index
+        if index is not None:
+            if self.refresh_s > 0 and time.monotonic() - self._built_at >= self.refresh_s:
+                with self._lock:
+                    start, self._rebuilding = not self._rebuilding, True
+                if start:
+                    threading.Thread(target=self._rebuild, name=f"{self.name}-rebuild", daemon=True).start()
+            return index
+        if self._backing_off():
+            return None
+        with self._lock:
+            if self._index is None and not self._backing_off():
+                self._load()
+            return self._index
+
+    def refresh(self):
+        self._built_at = float("-inf")
+        self._failed_at = None
+
+
+_cache = IndexCache(load_from_db, "suggest")
+
+
+def get_index():
+    """PrefixIndex 또는 None (DB 를 쓸 수 없을 때). 첫 빌드 후에는 요청마다 DB 를 조회하지 않는다."""
+    return _cache.get()
+
+
+def refresh():
+    """다음 get_index() 에서 어휘를 다시 읽게 한다."""
+    _cache.refresh()
+
+
+if __name__ == "__main__":
+    import random
+    import string
+
+    rnd = random.Random(0)
+    vocab = set()
+    while len(vocab) < 1_000_000:
+        vocab.add("".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 10))).title())
+    vocab = list(vocab)
+    t = time.perf_counter()
+    index = PrefixIndex(vocab, [rnd.paretovariate(1.2) for _ in vocab])
+    print(f"[INFO] built {len(index):,} names in {time.perf_counter() - t:.2f}s ({len(index._top):,} cached prefixes)")
+
+    prefixes = [w[:rnd.randint(1, 5)] for w in rnd.sample(vocab, 20000)]
+    lat = []
+    for p in prefixes:
+        t = time.perf_counter()
+        index.suggest(p)
+        lat.append(time.perf_counter() - t)
+    lat = np.array(lat) * 1000
+    print(f"[DONE] p50={np.percentile(lat, 50):.4f}ms p99={np.percentile(lat, 99):.4f}ms max={lat.max():.4f}ms")
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, Overloaded, deadline_from
+
+
+def test_deadline_is_capped_by_default():
+    ctl = AdmissionController(concurrency=2, queue=4, deadline_ms=1000)
+    assert ctl._deadline(None) == 1.0
+    assert ctl._deadline(250) == 0.25
+    assert ctl._deadline(5000) == 1.0
+    assert ctl._deadline(float("nan")) == 1.0
+    assert ctl._deadline(-1) == 1.0
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("250", 250.0), ("0", None), ("-5", None), ("nan", None), ("inf", None), ("soon", None), (None, None),
+])
+def test_deadline_from(value, expected):
+    headers = {} if value is None else {"X-Deadline-Ms": value}
+    assert deadline_from(headers) == expected
+
+
+def test_service_time_ewma():
+    ctl = AdmissionController(concurrency=1)
+    ctl.running = 1
+    ctl._release(start=time.perf_counter() - 0.2)  # 첫 측정은 그대로
+    assert ctl.service_time == pytest.approx(0.2, abs=0.05)
+    ctl.running = 1
+    ctl.service_time = 1.0
+    ctl._release(start=time.perf_counter() - 0.5)
+    assert ctl.service_time == pytest.approx(0.9 * 1.0 + 0.1 * 0.5, abs=0.01)
+    assert ctl.running == 0
+
+
+def test_reserve_sheds_on_expected_wait():
+    ctl = AdmissionController(concurrency=2, queue=4, deadline_ms=1000)
+    ctl.running, ctl.waiting, ctl.service_time = 2, 3, 0.5
+    # (3 + 1) / 2 * 0.5 = 1.0 초 대기 예상
+    with pytest.raises(Overloaded) as exc:
+        ctl._reserve(0.5)
+    assert exc.value.reason == "deadline"
+    assert exc.value.retry_after == 1  # ceil(3 / 2 * 0.5)
+    ctl._reserve(1.0)
+    assert ctl.waiting == 4
+    with pytest.raises(Overloaded) as exc:
+        ctl._reserve(10.0)
+    assert exc.value.reason == "queue_full"
+    assert ctl.counters["shed_deadline"] == 1 and ctl.counters["shed_queue_full"] == 1
+
+
+def test_retry_after():
+    ctl = AdmissionController(concurrency=2)
+    ctl.waiting, ctl.service_time = 6, 0.5
+    assert ctl._retry_after() == 2
+    ctl.waiting = 0
+    assert ctl._retry_after() == 1
+
+
+def test_slot_times_out_and_frees_queue():
+    ctl = AdmissionController(concurrency=1, queue=4, deadline_ms=1000)
+    entered, done = threading.Event(), threading.Event()
+
+    def hold():
+        with ctl.slot():
+            entered.set()
+            done.wait()
+
+    t = threading.Thread(target=hold)
+    t.start()
+    entered.wait()
+    try:
+        with pytest.raises(Overloaded) as exc, ctl.slot(deadline_ms=50):
+            pass
+        assert exc.value.reason == "deadline"
+        assert ctl.waiting == 0
+    finally:
+        done.set()
+        t.join()
+    assert ctl.running == 0
+    assert ctl.counters["admitted"] == 1
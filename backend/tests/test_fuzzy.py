@@ -0,0 +1,49 @@
+import itertools
+
+import pytest
+
+from fuzzy import FuzzyIndex, edit_distance, within_one
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("jonathan", "jonathan", 0),
+    ("jonathon", "jonathan", 1),   # 치환
+    ("jon", "john", 1),            # 삽입
+    ("jhon", "john", 1),           # 인접 전치 (Levenshtein 이면 2)
+    ("cathrine", "katherine", 2),
+])
+def test_edit_distance(a, b, expected):
+    assert edit_distance(a, b, 2) == expected
+    assert edit_distance(b, a, 2) == expected
+
+
+def test_edit_distance_bound():
+    assert edit_distance("abc", "xyz", 1) == 2
+    assert edit_distance("al", "alexander", 2) == 3  # 길이 차이만으로 bound 초과
+
+
+def test_within_one_matches_edit_distance():
+    words = ["john", "jhon", "jon", "joan", "johns", "jonh", "ojhn", "mary", "", "j"]
+    for a, b in itertools.product(words, repeat=2):
+        assert within_one(a, b) == (edit_distance(a, b, 1) <= 1), (a, b)
+
+
+@pytest.fixture
+def index():
+    names = ["Jonathan", "jonathan", "Jonas", "Emily", "Emilie", "Emma", "Jonathon2"]
+    popularity = [100, 1, 50, 80, 70, 60, 1]
+    return FuzzyIndex(names, popularity)
+
+
+def test_case_variants_collapse(index):
+    assert len(index) == 6
+    assert index.lookup("JONATHAN") == [("Jonathan", 0)]
+
+
+def test_canonical(index):
+    assert index.canonical("jonathan") == "Jonathan"
+    # 같은 거리의 덜 알려진 이름(Jonathon2)은 세지 않는다
+    assert index.canonical("Jonathon") == "Jonathan"
+    # 거리 1 에 인기 있는 이름이 둘이면 바꾸지 않는다
+    assert index.canonical("Emili") is None
+    assert index.canonical("Xavier") is None
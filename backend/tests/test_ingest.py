@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from ingest import IngestManifest, file_key
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    return src, tmp_path / "manifests", tmp_path / "partitions"
+
+
+def write(path, rows):
+    pd.DataFrame(rows, columns=["name", "count"]).to_csv(path, index=False)
+    return path
+
+
+def run(src, manifest_dir, partition_dir, parsed):
+    def parse(path):
+        parsed.append(path.name)
+        return pd.read_csv(path)
+
+    manifest = IngestManifest("test", manifest_dir, partition_dir)
+    frames, fresh, stale = manifest.sync(sorted(src.glob("*.csv")), parse)
+    totals = manifest.update_totals(frames, fresh, stale, "name", "count")
+    manifest.save()
+    return manifest, frames, totals
+
+
+def test_incremental_totals(dirs):
+    src, manifest_dir, partition_dir = dirs
+    a = write(src / "a.csv", [("민준", 3), ("서연", 2)])
+    write(src / "b.csv", [("민준", 1), ("지우", 4)])
+    parsed = []
+    _, _, totals = run(src, manifest_dir, partition_dir, parsed)
+    assert totals.to_dict() == {"민준": 4, "서연": 2, "지우": 4}
+
+    # b 변경, a 삭제, c 추가: 바뀐 파일만 다시 파싱하고 합계는 변경분으로 갱신
+    parsed.clear()
+    a.unlink()
+    write(src / "b.csv", [("민준", 5)])
+    write(src / "c.csv", [("하린", 7)])
+    manifest, frames, totals = run(src, manifest_dir, partition_dir, parsed)
+    assert sorted(parsed) == ["b.csv", "c.csv"]
+    assert not manifest.full_rebuild
+    assert totals.to_dict() == {"민준": 5, "하린": 7}
+    expected = pd.concat(frames.values()).groupby("name")["count"].sum()
+    assert totals.sort_index().to_dict() == expected.to_dict()
+    assert set(manifest.files) == {file_key(src / "b.csv"), file_key(src / "c.csv")}
+
+    # 변경 없음: 아무것도 다시 파싱하지 않는다
+    parsed.clear()
+    _, _, again = run(src, manifest_dir, partition_dir, parsed)
+    assert parsed == []
+    assert again.to_dict() == totals.to_dict()
+    # 지운 파티션(a, 예전 b)은 save() 에서 정리된다
+    assert len(list((partition_dir / "test").glob("*.csv"))) == 3  # b, c, _totals
+
+
+def test_missing_partition_forces_full_rebuild(dirs):
+    src, manifest_dir, partition_dir = dirs
+    write(src / "a.csv", [("민준", 3)])
+    b = write(src / "b.csv", [("지우", 4)])
+    manifest, _, _ = run(src, manifest_dir, partition_dir, [])
+    (partition_dir / "test" / manifest.files[file_key(b)]["partition"]).unlink()
+
+    write(src / "b.csv", [("지우", 1)])
+    manifest, _, totals = run(src, manifest_dir, partition_dir, [])
+    assert manifest.full_rebuild
+    assert totals.to_dict() == {"민준": 3, "지우": 1}
@@ -0,0 +1,25 @@
+from metrics import BUCKETS, Histogram
+
+
+def parse(lines):
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1]) for line in lines if not line.startswith("#")}
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram("t_seconds", "test", ("route",))
+    for value in (0.0001, 0.0003, 0.0003, 0.02, 10.0):
+        h.observe(value, "/a")
+    h.observe(0.5, "/b")
+    samples = parse(h.render())
+
+    # le 는 경계값을 포함한다 (0.0001 → le="0.0001")
+    assert samples['t_seconds_bucket{route="/a",le="0.0001"}'] == 1
+    assert samples['t_seconds_bucket{route="/a",le="0.00025"}'] == 1
+    assert samples['t_seconds_bucket{route="/a",le="0.0005"}'] == 3
+    assert samples['t_seconds_bucket{route="/a",le="0.025"}'] == 4
+    assert samples[f't_seconds_bucket{{route="/a",le="{BUCKETS[-1]}"}}'] == 4
+    assert samples['t_seconds_bucket{route="/a",le="+Inf"}'] == 5
+    assert samples['t_seconds_count{route="/a"}'] == 5
+    assert samples['t_seconds_sum{route="/a"}'] == round(0.0001 + 0.0006 + 0.02 + 10.0, 6)
+    assert samples['t_seconds_bucket{route="/b",le="0.25"}'] == 0
+    assert samples['t_seconds_bucket{route="/b",le="0.5"}'] == 1
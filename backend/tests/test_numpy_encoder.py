@@ -0,0 +1,24 @@
+"""NumPy 인코더가 keras 인코더와 같은 임베딩을 내는지 (TensorFlow 가 있는 환경에서만)"""
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from dual_encoder import build_encoder
+from numpy_encoder import NumpyEncoder, export_encoder, max_abs_diff
+
+
+def test_numpy_matches_keras(tmp_path):
+    tf.random.set_seed(0)
+    charset = {c: i + 2 for i, c in enumerate("abcdefghij")}
+    max_len = 6
+    encoder = build_encoder(len(charset) + 2, max_len)
+    path = tmp_path / "enc.npz"
+    export_encoder(encoder, charset, max_len, path, lower=True)
+
+    np_encoder = NumpyEncoder.load(path)
+    # 길이가 다른 이름(패딩 포함), 사전에 없는 문자(UNK), 최대 길이를 넘는 이름
+    ids = np_encoder.tokenize(["a", "Bad", "jihcde", "azz", "abcdefghij"])
+    assert ids[1].tolist() == [3, 2, 5, 0, 0, 0]
+    assert max_abs_diff(encoder, np_encoder, ids) < 1e-4
+    np.testing.assert_allclose(np.linalg.norm(np_encoder(ids), axis=1), 1.0, atol=1e-5)
@@ -0,0 +1,34 @@
+import random
+
+from suggest import PrefixIndex
+
+NAMES = ["Alice", "Alex", "Alexander", "Bob", "alicia"]
+POPULARITY = [5, 9, 1, 3, 7]
+
+
+def test_suggest_orders_by_popularity():
+    index = PrefixIndex(NAMES, POPULARITY)
+    assert index.suggest("al") == ["Alex", "alicia", "Alice", "Alexander"]
+    assert index.suggest(" ALE ") == ["Alex", "Alexander"]
+    assert index.suggest("al", limit=2) == ["Alex", "alicia"]
+    assert index.suggest("z") == []
+    assert index.suggest("") == []
+
+
+def test_precomputed_prefixes_match_scan():
+    rng = random.Random(0)
+    names = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 5))) for _ in range(300)]
+    popularity = [rng.random() for _ in names]
+    scan = PrefixIndex(names, popularity, limit=5, precompute_over=10 ** 9)
+    cached = PrefixIndex(names, popularity, limit=5, precompute_over=8)
+    assert cached._top and not scan._top
+    prefixes = {n[:i] for n in names for i in range(1, len(n) + 1)}
+    for prefix in prefixes:
+        for limit in (1, 5, 8):  # limit > index.limit 이면 미리 계산한 목록 대신 다시 고른다
+            assert cached.suggest(prefix, limit) == scan.suggest(prefix, limit), (prefix, limit)
+
+
+def test_empty_vocabulary():
+    index = PrefixIndex([], [])
+    assert len(index) == 0
+    assert index.suggest("a") == []